@@ -0,0 +1,235 @@
+"""End-to-end benchmark against the local SAAPA stand-in.
+
+Drives PlannedBlackoutsApiClient through the shared fetch engine, the
+coordinators and the calendar/sensor entities against fake_saapa.py, and
+reports requests/sec, p50/p99 refresh latency, event-loop lag and memory as
+the number of bills and outages per response grows.
+
+Usage: python benchmarks/bench_e2e.py [--bills 1,10,50] [--outages 10,100,1000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from homeassistant.util import dt as dt_util
+
+from harness import (
+    EventLoopLagMonitor,
+    async_start_hass,
+    make_config_entry,
+    percentile,
+)
+from fake_saapa import FakeSaapaApi
+
+from custom_components.bargheman_planned_blackouts.address_index import (
+    async_get_address_index,
+)
+from custom_components.bargheman_planned_blackouts.alerts import async_get_alerts
+from custom_components.bargheman_planned_blackouts.archive import (
+    async_get_archive,
+)
+from custom_components.bargheman_planned_blackouts.calendar import (
+    PlannedBlackoutsCalendar,
+)
+from custom_components.bargheman_planned_blackouts.coalesce import (
+    RequestCoalescer,
+)
+from custom_components.bargheman_planned_blackouts.const import (
+    DATA_COALESCER,
+    DATA_ENGINE,
+    DATA_RATE_LIMITER,
+)
+from custom_components.bargheman_planned_blackouts.coordinator import (
+    PlannedBlackoutsDataUpdateCoordinator,
+)
+from custom_components.bargheman_planned_blackouts.engine import (
+    PlannedBlackoutsFetchEngine,
+)
+from custom_components.bargheman_planned_blackouts.metrics import (
+    PlannedBlackoutsMetrics,
+)
+from custom_components.bargheman_planned_blackouts.ratelimit import TokenBucket
+from custom_components.bargheman_planned_blackouts.scheduler import (
+    async_get_scheduler,
+)
+from custom_components.bargheman_planned_blackouts.sensor import (
+    SENSOR_DESCRIPTIONS,
+    PlannedBlackoutsSensor,
+)
+from custom_components.bargheman_planned_blackouts.store import (
+    PlannedBlackoutsOutageStore,
+)
+
+
+async def _async_run_scenario(
+    bills: int,
+    outages: int,
+    rounds: int,
+    latency: float,
+    error_rate: float,
+    use_cache: bool,
+) -> Dict[str, Any]:
+    """Run one bills x outages scenario and return its measurements."""
+    fake_api = FakeSaapaApi(
+        latency=latency, error_rate=error_rate, outages_per_response=outages
+    )
+    url = await fake_api.async_start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        if not use_cache:
+            # Every round should reach the API rather than the memo
+            hass.data[DATA_COALESCER] = RequestCoalescer(memo_ttl=0)
+        # Measure the integration, not the domain-wide rate limit
+        hass.data[DATA_RATE_LIMITER] = TokenBucket(rate=1e9, capacity=1e9)
+        engine = hass.data[DATA_ENGINE] = PlannedBlackoutsFetchEngine(hass, api_url=url)
+
+        # The first, untimed round measures the memory retained per bill
+        tracemalloc.start()
+        coordinators = []
+        entities = []
+        for number in range(bills):
+            entry = make_config_entry(f"bench{number:05d}", days_ahead=14)
+            metrics = PlannedBlackoutsMetrics()
+            coordinator = PlannedBlackoutsDataUpdateCoordinator(
+                hass,
+                entry=entry,
+                api=engine.async_register(
+                    entry.entry_id,
+                    entry.data["bill_id"],
+                    entry.data["api_token"],
+                    metrics=metrics,
+                ),
+                engine=engine,
+                store=PlannedBlackoutsOutageStore(hass, entry.data["bill_id"]),
+                metrics=metrics,
+                scheduler=async_get_scheduler(hass),
+                archive=async_get_archive(hass),
+                alerts=async_get_alerts(hass),
+                address_index=async_get_address_index(hass),
+            )
+            coordinators.append(coordinator)
+            for entity in [
+                PlannedBlackoutsCalendar(coordinator),
+                *(
+                    PlannedBlackoutsSensor(coordinator, description)
+                    for description in SENSOR_DESCRIPTIONS
+                ),
+            ]:
+                entity.hass = hass
+                entity.entity_id = (
+                    f"{'calendar' if isinstance(entity, PlannedBlackoutsCalendar) else 'sensor'}"
+                    f".bench_{number:05d}_{len(entities)}"
+                )
+                entities.append(entity)
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        latencies: List[float] = []
+        write_times: List[float] = []
+        lag = EventLoopLagMonitor()
+        requests_before = fake_api.request_count
+
+        async def _timed_refresh(coordinator: PlannedBlackoutsDataUpdateCoordinator) -> None:
+            if not use_cache:
+                coordinator.api._day_cache.clear()  # pylint: disable=protected-access
+            started = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append(time.perf_counter() - started)
+
+        lag.start()
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(_timed_refresh(coordinator) for coordinator in coordinators))
+            write_started = time.perf_counter()
+            now = dt_util.now()
+            for entity in entities:
+                if isinstance(entity, PlannedBlackoutsCalendar):
+                    await entity.async_get_events(hass, now, now + timedelta(days=7))
+                entity.async_write_ha_state()
+            write_times.append(time.perf_counter() - write_started)
+        elapsed = time.perf_counter() - started
+        await lag.stop()
+
+        requests = fake_api.request_count - requests_before
+        await engine.async_shutdown()
+        await hass.async_stop(force=True)
+
+    await fake_api.async_stop()
+    return {
+        "bills": bills,
+        "outages": outages,
+        "requests_per_sec": requests / elapsed,
+        "refresh_p50_ms": percentile(latencies, 50) * 1000,
+        "refresh_p99_ms": percentile(latencies, 99) * 1000,
+        "state_write_ms": percentile(write_times, 50) * 1000,
+        "loop_lag_p99_ms": percentile(lag.samples, 99) * 1000,
+        "memory_per_bill_kib": memory / bills / 1024,
+    }
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    """Run every scenario and print a table of results."""
+    columns = [
+        ("bills", 6, "d"),
+        ("outages", 8, "d"),
+        ("requests_per_sec", 17, ".1f"),
+        ("refresh_p50_ms", 15, ".2f"),
+        ("refresh_p99_ms", 15, ".2f"),
+        ("state_write_ms", 15, ".2f"),
+        ("loop_lag_p99_ms", 16, ".2f"),
+        ("memory_per_bill_kib", 20, ".1f"),
+    ]
+    print(" ".join(f"{name:>{width}}" for name, width, _ in columns))
+    for bills in args.bills:
+        for outages in args.outages:
+            result = await _async_run_scenario(
+                bills,
+                outages,
+                args.rounds,
+                args.latency,
+                args.error_rate,
+                args.use_cache,
+            )
+            print(
+                " ".join(
+                    f"{result[name]:>{width}{spec}}" for name, width, spec in columns
+                )
+            )
+
+
+def _int_list(value: str) -> List[int]:
+    """Parse a comma separated list of integers."""
+    return [int(item) for item in value.split(",")]
+
+
+def main() -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bills", type=_int_list, default=[1, 10, 50])
+    parser.add_argument("--outages", type=_int_list, default=[10, 100, 1000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests answered with HTTP 500, to exercise retries",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="keep the per-day response cache between rounds",
+    )
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmark for the Jalali conversion layer.
+
+Compares the jdatetime ``strptime`` path the API client used to take for
+every outage with the day table / memo path in ``jalali.py`` on large
+synthetic responses.
+
+Usage: python benchmarks/bench_jalali.py [--outages N] [--repeat N]
+"""
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+import jdatetime
+
+JALALI_PATH = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components"
+    / "bargheman_planned_blackouts"
+    / "jalali.py"
+)
+
+
+def _load_jalali():
+    """Load jalali.py without importing the Home Assistant integration."""
+    spec = importlib.util.spec_from_file_location("jalali", JALALI_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _synthetic_items(count: int, days: int) -> list:
+    """Build outage items spread over the next few days."""
+    rng = random.Random(0)
+    today = date.today()
+    shamsi_days = [
+        jdatetime.date.fromgregorian(date=today + timedelta(days=offset)).strftime(
+            "%Y/%m/%d"
+        )
+        for offset in range(days)
+    ]
+    items = []
+    for _ in range(count):
+        hour = rng.randrange(0, 22)
+        items.append(
+            (
+                rng.choice(shamsi_days),
+                f"{hour:02d}:{rng.choice((0, 15, 30, 45)):02d}",
+                f"{hour + 2:02d}:00",
+            )
+        )
+    return items
+
+
+def _strptime_path(items: list) -> list:
+    """Convert items the way the API client used to."""
+    return [
+        (
+            jdatetime.datetime.strptime(f"{day} {start}", "%Y/%m/%d %H:%M").togregorian(),
+            jdatetime.datetime.strptime(f"{day} {end}", "%Y/%m/%d %H:%M").togregorian(),
+        )
+        for day, start, end in items
+    ]
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--outages", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    jalali = _load_jalali()
+    items = _synthetic_items(args.outages, args.days)
+    today = date.today()
+    jalali.prepare_window(today, today + timedelta(days=args.days))
+
+    def _fast_path() -> list:
+        return [
+            (jalali.from_shamsi(day, start), jalali.from_shamsi(day, end))
+            for day, start, end in items
+        ]
+
+    if _fast_path() != _strptime_path(items):
+        raise SystemExit("Conversion results differ between the two paths")
+
+    baseline = min(timeit.repeat(lambda: _strptime_path(items), number=1, repeat=args.repeat))
+    fast = min(timeit.repeat(_fast_path, number=1, repeat=args.repeat))
+
+    print(f"outages:        {args.outages}")
+    print(f"strptime path:  {baseline * 1000:9.2f} ms  ({baseline / args.outages * 1e6:.2f} us/outage)")
+    print(f"jalali path:    {fast * 1000:9.2f} ms  ({fast / args.outages * 1e6:.2f} us/outage)")
+    print(f"speedup:        {baseline / fast:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
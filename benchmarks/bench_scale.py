@@ -0,0 +1,236 @@
+"""Scale benchmark with hundreds of config entries.
+
+Starts a Home Assistant instance with N planned-blackouts entries against
+fake_saapa.py replaying a recorded report response, and measures the total
+setup time, CPU time per refresh cycle of all entries, event-loop lag,
+memory per entry and state writes per cycle. The fake API runs in its own
+process, so the CPU time is that of Home Assistant and the integration.
+
+The results are compared with a committed baseline for the same number of
+entries, and the script exits nonzero when a metric regresses past the
+tolerance. Timings depend on the machine, so refresh the baseline with
+--update-baseline on the machine that runs the check.
+
+Usage: python benchmarks/bench_scale.py [--entries 200] [--update-baseline]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, callback
+
+from harness import (
+    INTEGRATION_DOMAIN,
+    EventLoopLagMonitor,
+    async_start_hass,
+    make_config_entry,
+    percentile,
+)
+
+from custom_components.bargheman_planned_blackouts.coalesce import (
+    RequestCoalescer,
+)
+from custom_components.bargheman_planned_blackouts.const import (
+    DATA_COALESCER,
+    DATA_ENGINE,
+    DATA_RATE_LIMITER,
+)
+from custom_components.bargheman_planned_blackouts.engine import (
+    PlannedBlackoutsFetchEngine,
+)
+from custom_components.bargheman_planned_blackouts.ratelimit import TokenBucket
+
+BENCHMARKS = Path(__file__).resolve().parent
+DEFAULT_FIXTURE = BENCHMARKS / "fixtures" / "saapa_report.json"
+DEFAULT_BASELINE = BENCHMARKS / "baseline.json"
+
+# Allowance on top of the relative tolerance, for metrics whose baseline is
+# small enough that scheduling noise alone would fail the check
+ABSOLUTE_SLACK = {
+    "setup_total_s": 0.5,
+    "cpu_per_cycle_ms": 50.0,
+    "loop_lag_p99_ms": 10.0,
+    "memory_per_entry_kib": 4.0,
+    "state_writes_per_cycle": 0.0,
+}
+
+
+def start_fake_api(fixture: Path) -> Tuple[subprocess.Popen, str]:
+    """Start fake_saapa.py in its own process and return it and its URL."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-u",
+            str(BENCHMARKS / "fake_saapa.py"),
+            "--port",
+            str(port),
+            "--fixture",
+            str(fixture),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # The server announces its URL once it is listening
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError("The fake API did not start")
+    return process, line.split()[-1]
+
+
+async def async_measure(
+    url: str, entries: int, cycles: int, memory_sample: int
+) -> Dict[str, float]:
+    """Set up the entries, run refresh cycles and return the metrics."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        # Measure the integration, not the limits protecting the real API
+        hass.data[DATA_RATE_LIMITER] = TokenBucket(rate=1e9, capacity=1e9)
+        hass.data[DATA_COALESCER] = RequestCoalescer(memo_ttl=0)
+        hass.data[DATA_ENGINE] = PlannedBlackoutsFetchEngine(hass, api_url=url)
+
+        config_entries = [
+            make_config_entry(f"scale{number:05d}") for number in range(entries)
+        ]
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(hass.config_entries.async_add(entry) for entry in config_entries)
+        )
+        await hass.async_block_till_done()
+        setup_total = time.perf_counter() - started
+        failed = [entry for entry in config_entries if entry.state.value != "loaded"]
+        if failed:
+            raise RuntimeError(f"{len(failed)} config entries failed to set up")
+
+        # Tracing slows everything down, so memory is measured on extra entries
+        tracemalloc.start()
+        for number in range(memory_sample):
+            await hass.config_entries.async_add(
+                make_config_entry(f"memory{number:05d}")
+            )
+        await hass.async_block_till_done()
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        state_writes = 0
+
+        @callback
+        def _count_state_write(event: Event) -> None:
+            nonlocal state_writes
+            state_writes += 1
+
+        unsubscribe = hass.bus.async_listen(EVENT_STATE_CHANGED, _count_state_write)
+        coordinators = list(hass.data[INTEGRATION_DOMAIN].values())
+        cpu_times: List[float] = []
+        lag = EventLoopLagMonitor()
+        lag.start()
+        for _ in range(cycles):
+            cpu_started = time.process_time()
+            for coordinator in coordinators:
+                coordinator.api._day_cache.clear()  # pylint: disable=protected-access
+            await asyncio.gather(
+                *(coordinator.async_refresh() for coordinator in coordinators)
+            )
+            await hass.async_block_till_done()
+            cpu_times.append(time.process_time() - cpu_started)
+        await lag.stop()
+        unsubscribe()
+
+        await hass.async_stop(force=True)
+
+    return {
+        "setup_total_s": setup_total,
+        "cpu_per_cycle_ms": percentile(cpu_times, 50) * 1000,
+        "loop_lag_p99_ms": percentile(lag.samples, 99) * 1000,
+        "memory_per_entry_kib": memory / memory_sample / 1024,
+        "state_writes_per_cycle": state_writes / cycles,
+    }
+
+
+def find_regressions(
+    results: Dict[str, float], baseline: Dict[str, float], tolerance: float
+) -> List[str]:
+    """Return a description of every metric that regressed past the baseline."""
+    failures = []
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name] * (1 + tolerance) + ABSOLUTE_SLACK.get(name, 0.0)
+        if value > limit:
+            failures.append(
+                f"{name} is {value:.2f}, baseline {baseline[name]:.2f} (limit {limit:.2f})"
+            )
+    return failures
+
+
+def main() -> None:
+    """Parse arguments, run the measurements and check them against the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=200)
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--memory-sample", type=int, default=10)
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fraction a metric may exceed its baseline by",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="record the results as the baseline for this number of entries",
+    )
+    args = parser.parse_args()
+
+    process, url = start_fake_api(args.fixture)
+    try:
+        results = asyncio.run(
+            async_measure(url, args.entries, args.cycles, max(args.memory_sample, 1))
+        )
+    finally:
+        process.terminate()
+        process.wait()
+
+    for name, value in results.items():
+        print(f"{name:>24}: {value:10.2f}")
+
+    baselines: Dict[str, Dict[str, float]] = {}
+    if args.baseline.exists():
+        baselines = json.loads(args.baseline.read_text())
+    key = str(args.entries)
+
+    if args.update_baseline:
+        baselines[key] = {name: round(value, 2) for name, value in results.items()}
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Recorded the baseline for {args.entries} entries")
+        return
+
+    if key not in baselines:
+        print(f"No baseline for {args.entries} entries", file=sys.stderr)
+        sys.exit(1)
+
+    failures = find_regressions(results, baselines[key], args.tolerance)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""Startup benchmark for the integration.
+
+Measures how long importing the integration package takes in a fresh
+interpreter, which heavy modules that import drags in, and the latency of
+async_setup_entry per config entry against the local SAAPA stand-in, both
+cold (fetching from the API) and warm (coming up from the on-disk cache).
+
+With --max-import-ms and --max-setup-ms the script exits nonzero when a
+budget is exceeded, so it can run as a check.
+
+Usage: python benchmarks/bench_startup.py [--entries 10] [--max-setup-ms 200]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from harness import REPO_ROOT, async_start_hass, make_config_entry, percentile
+from fake_saapa import FakeSaapaApi
+
+from custom_components.bargheman_planned_blackouts.const import DATA_ENGINE
+from custom_components.bargheman_planned_blackouts.engine import (
+    PlannedBlackoutsFetchEngine,
+)
+
+# Modules the integration should only import when they are actually needed
+LAZY_MODULES = ["jdatetime", "homeassistant.components.calendar"]
+
+_IMPORT_PROBE = f"""
+import sys, time
+import homeassistant.config_entries, homeassistant.helpers.update_coordinator
+started = time.perf_counter()
+import custom_components.bargheman_planned_blackouts
+elapsed = time.perf_counter() - started
+print(elapsed, *[name for name in {LAZY_MODULES!r} if name in sys.modules])
+"""
+
+
+def measure_import(runs: int) -> Dict[str, Any]:
+    """Import the package in fresh interpreters and return the median time."""
+    times: List[float] = []
+    eager: List[str] = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_PROBE],
+            capture_output=True,
+            check=True,
+            cwd=REPO_ROOT,
+            text=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        eager = output[1:]
+
+    return {"import_ms": statistics.median(times) * 1000, "eager_modules": eager}
+
+
+async def async_measure_setup(entries: int, outages: int) -> Dict[str, float]:
+    """Set up config entries cold, unload them and set them up again warm."""
+    fake_api = FakeSaapaApi(outages_per_response=outages)
+    url = await fake_api.async_start()
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        hass.data[DATA_ENGINE] = PlannedBlackoutsFetchEngine(hass, api_url=url)
+
+        config_entries = [
+            make_config_entry(f"startup{number:05d}") for number in range(entries)
+        ]
+        cold: List[float] = []
+        for entry in config_entries:
+            started = time.perf_counter()
+            await hass.config_entries.async_add(entry)
+            cold.append(time.perf_counter() - started)
+            if entry.state.value != "loaded":
+                raise RuntimeError(f"Config entry failed to set up: {entry.state}")
+
+        # Keep one entry loaded so the shared engine stays up
+        for entry in config_entries[1:]:
+            await hass.config_entries.async_unload(entry.entry_id)
+
+        warm: List[float] = []
+        for entry in config_entries[1:]:
+            started = time.perf_counter()
+            await hass.config_entries.async_setup(entry.entry_id)
+            warm.append(time.perf_counter() - started)
+
+        await hass.async_stop(force=True)
+
+    await fake_api.async_stop()
+    return {
+        "cold_setup_p50_ms": percentile(cold, 50) * 1000,
+        "cold_setup_p99_ms": percentile(cold, 99) * 1000,
+        "warm_setup_p50_ms": percentile(warm, 50) * 1000,
+        "warm_setup_p99_ms": percentile(warm, 99) * 1000,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the measurements and check the budgets."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=10)
+    parser.add_argument("--outages", type=int, default=20)
+    parser.add_argument("--import-runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float)
+    parser.add_argument("--max-setup-ms", type=float)
+    args = parser.parse_args()
+
+    results = measure_import(args.import_runs)
+    results.update(asyncio.run(async_measure_setup(max(args.entries, 2), args.outages)))
+
+    for name, value in results.items():
+        if isinstance(value, float):
+            print(f"{name:>20}: {value:8.2f}")
+        else:
+            print(f"{name:>20}: {', '.join(value) or '-'}")
+
+    failures = []
+    if results["eager_modules"]:
+        failures.append(f"imported eagerly: {', '.join(results['eager_modules'])}")
+    if args.max_import_ms is not None and results["import_ms"] > args.max_import_ms:
+        failures.append(f"import took {results['import_ms']:.2f} ms")
+    if (
+        args.max_setup_ms is not None
+        and results["cold_setup_p99_ms"] > args.max_setup_ms
+    ):
+        failures.append(f"setup p99 took {results['cold_setup_p99_ms']:.2f} ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Local stand-in for the SAAPA PlannedBlackoutsReport endpoint.
+
+Serves synthetic outages for whatever bill and Shamsi date range is
+requested, with configurable latency, error and 401 rates and payload size,
+so the integration can be measured without hitting uiapi.saapa.ir. With a
+fixture, replays a recorded response instead, moved to the requested days.
+
+Usage: python benchmarks/fake_saapa.py [--port 8080] [--latency 0.2] ...
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import zlib
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import jdatetime
+from aiohttp import web
+
+REPORT_PATH = "/api/ebills/PlannedBlackoutsReport"
+
+_STREETS = [
+    "Valiasr St",
+    "Enghelab St",
+    "Azadi Sq",
+    "Shariati St",
+    "Motahari St",
+    "Jomhouri St",
+    "Keshavarz Blvd",
+    "Mirdamad Blvd",
+]
+_REASONS = [
+    "Network maintenance",
+    "Transformer replacement",
+    "Load management",
+    "Cable repair",
+]
+
+
+class FakeSaapaApi:
+    """aiohttp application emulating the PlannedBlackoutsReport endpoint."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unauthorized_rate: float = 0.0,
+        outages_per_response: int = 10,
+        seed: int = 0,
+        fixture: Optional[str] = None,
+    ) -> None:
+        """Initialize the fake API."""
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.unauthorized_rate = unauthorized_rate
+        self.outages_per_response = outages_per_response
+        self.request_count = 0
+        self.response_bytes = 0
+        self._rng = random.Random(seed)
+        # (days after the first recorded day, recorded item)
+        self._fixture: Optional[List[Tuple[int, Dict[str, Any]]]] = None
+        if fixture is not None:
+            self._fixture = load_fixture(fixture)
+        self._runner: Optional[web.AppRunner] = None
+        self.app = web.Application()
+        self.app.router.add_post(REPORT_PATH, self._handle_report)
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the report URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        return f"http://{host}:{bound_port}{REPORT_PATH}"
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_report(self, request: web.Request) -> web.Response:
+        """Answer a report request."""
+        self.request_count += 1
+        payload = await request.json()
+
+        delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._rng.random() < self.unauthorized_rate:
+            return web.json_response({"message": "Unauthorized"}, status=401)
+        if self._rng.random() < self.error_rate:
+            return web.json_response({"message": "Internal error"}, status=500)
+
+        response = web.json_response(
+            {
+                "data": self.build_outages(
+                    payload["bill_id"], payload["from_date"], payload["to_date"]
+                )
+            }
+        )
+        self.response_bytes += len(response.body)
+        return response
+
+    def build_outages(
+        self, bill_id: str, from_date: str, to_date: str
+    ) -> List[Dict[str, Any]]:
+        """Build deterministic outages for a bill and Shamsi date range."""
+        first = jdatetime.datetime.strptime(from_date, "%Y/%m/%d").date()
+        last = jdatetime.datetime.strptime(to_date, "%Y/%m/%d").date()
+        days = (last.togregorian() - first.togregorian()).days + 1
+        if self._fixture is not None:
+            return self._replay_fixture(bill_id, first, days)
+
+        rng = random.Random(zlib.crc32(f"{bill_id}{from_date}{to_date}".encode()))
+
+        outages = []
+        for number in range(self.outages_per_response):
+            day = first + timedelta(days=rng.randrange(days))
+            start_hour = rng.randrange(0, 22)
+            outages.append(
+                {
+                    "outage_date": day.strftime("%Y/%m/%d"),
+                    "outage_start_time": f"{start_hour:02d}:00",
+                    "outage_stop_time": f"{start_hour + rng.randrange(1, 3):02d}:00",
+                    "reason_outage": rng.choice(_REASONS),
+                    "address": f"Tehran, {rng.choice(_STREETS)}, No. {rng.randrange(1, 40)}",
+                    "outage_number": f"{bill_id}-{day.strftime('%Y%m%d')}-{number}",
+                }
+            )
+        return outages
+
+    def _replay_fixture(
+        self, bill_id: str, first: jdatetime.date, days: int
+    ) -> List[Dict[str, Any]]:
+        """Move the recorded outages onto the requested days of a bill."""
+        outages = []
+        for offset, item in self._fixture:
+            if offset >= days:
+                continue
+            outages.append(
+                {
+                    **item,
+                    "outage_date": (first + timedelta(days=offset)).strftime(
+                        "%Y/%m/%d"
+                    ),
+                    "outage_number": f"{bill_id}-{item['outage_number']}",
+                }
+            )
+        return outages
+
+
+def load_fixture(path: str) -> List[Tuple[int, Dict[str, Any]]]:
+    """Load a recorded report response, keyed by day within the recording."""
+    with open(path, encoding="utf-8") as file:
+        items = json.load(file)["data"]
+
+    dates = [
+        jdatetime.datetime.strptime(item["outage_date"], "%Y/%m/%d").togregorian()
+        for item in items
+    ]
+    first = min(dates)
+    return [((day - first).days, item) for day, item in zip(dates, items)]
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Serve the fake API until interrupted."""
+    api = FakeSaapaApi(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        unauthorized_rate=args.unauthorized_rate,
+        outages_per_response=args.outages,
+        fixture=args.fixture,
+    )
+    url = await api.async_start(args.host, args.port)
+    print(f"Serving fake SAAPA API at {url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.async_stop()
+
+
+def main() -> None:
+    """Parse arguments and serve."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--unauthorized-rate", type=float, default=0.0)
+    parser.add_argument("--outages", type=int, default=10)
+    parser.add_argument("--fixture", help="recorded response to replay")
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Shared helpers for the Home Assistant driven benchmarks."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from homeassistant import config_entries, loader
+from homeassistant.auth import auth_manager_from_config
+from homeassistant.helpers import (
+    area_registry,
+    device_registry,
+    entity,
+    entity_registry,
+    frame,
+    translation,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+INTEGRATION_DOMAIN = "bargheman_planned_blackouts"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a bare Home Assistant instance that can load the integration."""
+    custom_components = os.path.join(config_dir, "custom_components")
+    if not os.path.exists(custom_components):
+        os.symlink(REPO_ROOT / "custom_components", custom_components)
+
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config.skip_pip = True
+    # Helpers that bootstrap sets up on newer Home Assistant versions
+    for helper in (frame, translation):
+        if hasattr(helper, "async_setup"):
+            helper.async_setup(hass)
+    # Platforms need the registries to add their entities
+    entity.async_setup(hass)
+    await area_registry.async_load(hass)
+    await device_registry.async_load(hass)
+    await entity_registry.async_load(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await hass.config_entries.async_initialize()
+    await hass.async_start()
+
+    # The calendar platform depends on the HTTP server
+    hass.auth = await auth_manager_from_config(hass, [], [])
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    await async_setup_component(
+        hass, "http", {"http": {"server_host": ["127.0.0.1"], "server_port": port}}
+    )
+    return hass
+
+
+def make_config_entry(bill_id: str, **data: Any) -> config_entries.ConfigEntry:
+    """Build a config entry for a bill, whatever the installed HA version."""
+    values = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": INTEGRATION_DOMAIN,
+        "title": f"SAAPA Bill ID: {bill_id}",
+        "data": {"bill_id": bill_id, "api_token": "benchmark", **data},
+        "source": config_entries.SOURCE_USER,
+        "options": {},
+        "unique_id": None,
+        "discovery_keys": {},
+        "subentries_data": None,
+    }
+    parameters = inspect.signature(config_entries.ConfigEntry).parameters
+    return config_entries.ConfigEntry(
+        **{key: value for key, value in values.items() if key in parameters}
+    )
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the pct percentile of values using nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes up a periodic sleeper."""
+
+    def __init__(self, interval: float = 0.01) -> None:
+        """Initialize the monitor."""
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.samples: List[float] = []
+
+    def start(self) -> None:
+        """Start sampling."""
+        self.samples.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _sample(self) -> None:
+        """Record the oversleep of every wakeup."""
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self.samples.append(time.perf_counter() - started - self._interval)
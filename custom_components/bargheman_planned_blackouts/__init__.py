@@ -2,39 +2,66 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime, timedelta
-
-import jdatetime
-import voluptuous as vol
+import sqlite3
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
+from . import jalali
+from .address_index import async_get_address_index
+from .alerts import async_get_alerts
+from .archive import async_get_archive
 from .const import (
     CONF_API_TOKEN,
     CONF_BILL_ID,
-    CONF_DAYS_AHEAD,
-    CONF_POLLING_INTERVAL,
+    CONF_PROVIDERS,
+    CONF_REPORT_URLS,
+    DATA_ENGINE,
+    DEFAULT_PROVIDERS,
     DOMAIN,
-    UPDATE_INTERVAL,
 )
+from .coordinator import PlannedBlackoutsDataUpdateCoordinator
+from .engine import PlannedBlackoutsFetchEngine, async_get_engine
+from .metrics import PlannedBlackoutsMetrics
+from .scheduler import async_get_scheduler
+from .services import async_setup_services
+from .views import PlannedBlackoutsCombinedIcsView, PlannedBlackoutsIcsView
+from .store import PlannedBlackoutsOutageStore
 
 _LOGGER = logging.getLogger(__name__)
 
 # Supported platforms
-PLATFORMS = [Platform.CALENDAR, Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.CALENDAR, Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Planned Blackouts services and calendar feeds."""
+    async_setup_services(hass)
+    hass.http.register_view(PlannedBlackoutsIcsView())
+    hass.http.register_view(PlannedBlackoutsCombinedIcsView())
+    return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Planned Blackouts from a config entry."""
-    # Create API client
-    api = PlannedBlackoutsApiClient(
-        async_get_clientsession(hass),
-        entry.data[CONF_API_TOKEN],
+    # Import the Shamsi calendar in the executor rather than on first use
+    await hass.async_add_executor_job(jalali.load)
+
+    # Register the bill with the shared fetch engine
+    engine = async_get_engine(hass)
+    metrics = PlannedBlackoutsMetrics()
+    api = engine.async_register(
+        entry.entry_id,
         entry.data[CONF_BILL_ID],
+        entry.data[CONF_API_TOKEN],
+        metrics=metrics,
+        providers=entry.data.get(CONF_PROVIDERS, DEFAULT_PROVIDERS),
+        report_urls=entry.data.get(CONF_REPORT_URLS, []),
     )
 
     # Create coordinator
@@ -42,10 +69,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass,
         entry=entry,
         api=api,
+        engine=engine,
+        store=PlannedBlackoutsOutageStore(hass, entry.data[CONF_BILL_ID]),
+        metrics=metrics,
+        scheduler=async_get_scheduler(hass),
+        archive=async_get_archive(hass),
+        alerts=async_get_alerts(hass),
+        address_index=async_get_address_index(hass),
     )
+    entry.async_on_unload(coordinator.async_detach)
 
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
+    # Come up from the on-disk cache when possible and revalidate it in the
+    # background, otherwise block on the initial fetch
+    if not await coordinator.async_load_cache():
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await _async_release_engine(hass, entry)
+            raise
+    else:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} revalidate cache"
+        )
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -69,73 +114,23 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        await _async_release_engine(hass, entry)
 
     return unload_ok
 
 
-class PlannedBlackoutsDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching Planned Blackouts data."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        entry: ConfigEntry,
-        api: PlannedBlackoutsApiClient,
-    ) -> None:
-        """Initialize the coordinator."""
-        self.entry = entry
-        self.api = api
-        
-        # Calculate update interval from config
-        update_interval = timedelta(
-            seconds=entry.data.get(CONF_POLLING_INTERVAL, UPDATE_INTERVAL.total_seconds())
-        )
-        
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=update_interval,
-        )
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached and archived outages of a deleted config entry."""
+    await PlannedBlackoutsOutageStore(hass, entry.data[CONF_BILL_ID]).async_remove()
+    try:
+        await async_get_archive(hass).async_remove_bill(entry.data[CONF_BILL_ID])
+    except sqlite3.Error as err:
+        _LOGGER.warning("Error removing archived outages: %s", err)
 
-    async def _async_update_data(self):
-        """Fetch data from API."""
-        try:
-            # Calculate the date range (today to days_ahead)
-            from datetime import datetime, timedelta
-            today = datetime.now()
-            days_ahead = self.entry.data.get(CONF_DAYS_AHEAD, 7)
-            end_date = today + timedelta(days=days_ahead)
-            
-            # Make the API request
-            outages = await self.api.async_get_outages(today, end_date)
-            
-            if not outages:
-                return {
-                    "outages": [],
-                    "next_outage": None,
-                    "today_count": 0,
-                }
-            
-            # Process the data for Home Assistant
-            today_date = today.date()
-            today_count = sum(1 for outage in outages if outage["start"].date() == today_date)
-            
-            # Find the next upcoming outage
-            next_outage = None
-            for outage in outages:
-                if outage["start"] > today:
-                    if next_outage is None or outage["start"] < next_outage["start"]:
-                        next_outage = outage
-            
-            return {
-                "outages": outages,
-                "next_outage": next_outage,
-                "today_count": today_count,
-            }
-            
-        except ConfigEntryAuthFailed as err:
-            # Handle authentication errors to trigger reauthentication
-            raise ConfigEntryAuthFailed(f"Authentication failed: {err}")
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with API: {err}")
+
+async def _async_release_engine(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Unregister an entry and stop the fetch engine once no entries remain."""
+    engine: PlannedBlackoutsFetchEngine = hass.data[DATA_ENGINE]
+    if engine.async_unregister(entry.entry_id):
+        await engine.async_shutdown()
+        hass.data.pop(DATA_ENGINE)
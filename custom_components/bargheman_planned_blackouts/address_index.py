@@ -0,0 +1,182 @@
+"""Inverted index over the outage addresses of all config entries."""
+from __future__ import annotations
+
+import bisect
+import logging
+import re
+import unicodedata
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_ADDRESS_INDEX
+from .models import Outage
+
+_LOGGER = logging.getLogger(__name__)
+
+# Arabic code points that Persian text commonly mixes in, and Persian and
+# Arabic-Indic digits, mapped to one spelling
+_CHARACTER_MAP = str.maketrans(
+    {
+        "ي": "ی",  # Arabic yeh -> Persian yeh
+        "ى": "ی",  # alef maksura -> Persian yeh
+        "ك": "ک",  # Arabic kaf -> keheh
+        "ة": "ه",  # teh marbuta -> heh
+        "أ": "ا",  # alef with hamza above -> alef
+        "إ": "ا",  # alef with hamza below -> alef
+        "ٱ": "ا",  # alef wasla -> alef
+        "\u0640": None,  # tatweel
+        "\u200c": None,  # zero width non-joiner
+        **{chr(0x06F0 + digit): str(digit) for digit in range(10)},
+        **{chr(0x0660 + digit): str(digit) for digit in range(10)},
+    }
+)
+_TOKEN = re.compile(r"\w+")
+
+# (entry_id, outage number, outage start, address), the address telling apart
+# outages the API reports at the same time without a number
+_DocKey = Tuple[str, str, datetime, str]
+
+
+class AddressMatch(NamedTuple):
+    """An outage whose address matches a search."""
+
+    entry_id: str
+    bill_id: str
+    outage: Outage
+
+
+@lru_cache(maxsize=4096)
+def tokenize(text: str) -> FrozenSet[str]:
+    """Return the normalized tokens of a Persian or Latin text."""
+    text = unicodedata.normalize("NFKC", text).translate(_CHARACTER_MAP)
+    # Drop diacritics such as the Arabic harakat
+    text = "".join(
+        character for character in text if not unicodedata.combining(character)
+    )
+    return frozenset(_TOKEN.findall(text.casefold()))
+
+
+class PlannedBlackoutsAddressIndex:
+    """Map address tokens to the outages of every config entry.
+
+    Postings hold outage keys per token, and the sorted vocabulary answers
+    prefix queries by bisection. Refreshes only add and remove the outages
+    of an entry that changed.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: Dict[str, Set[_DocKey]] = {}
+        self._vocabulary: List[str] = []
+        self._outages: Dict[_DocKey, Outage] = {}
+        self._entry_keys: Dict[str, Set[_DocKey]] = {}
+        self._bill_ids: Dict[str, str] = {}
+
+    @callback
+    def async_update(
+        self, entry_id: str, bill_id: str, outages: Iterable[Outage]
+    ) -> None:
+        """Replace the outages of an entry."""
+        current = {
+            (entry_id, outage.outage_number, outage.start, outage.address): outage
+            for outage in outages
+        }
+        previous = self._entry_keys.get(entry_id, set())
+
+        for key in previous - current.keys():
+            self._remove(key)
+        for key, outage in current.items():
+            if key not in previous:
+                self._add(key, outage)
+            else:
+                self._outages[key] = outage
+
+        self._entry_keys[entry_id] = set(current)
+        self._bill_ids[entry_id] = bill_id
+
+    @callback
+    def async_remove(self, entry_id: str) -> None:
+        """Drop the outages of an unloaded entry."""
+        for key in self._entry_keys.pop(entry_id, set()):
+            self._remove(key)
+        self._bill_ids.pop(entry_id, None)
+
+    def search(
+        self,
+        query: str,
+        prefix: bool = True,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> List[AddressMatch]:
+        """Return the outages whose address has every token of the query.
+
+        With prefix, query tokens also match longer address tokens. Outages
+        can be narrowed to those overlapping start..end.
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        matches: Optional[Set[_DocKey]] = None
+        # Intersect the rarest token first to keep the candidate set small
+        for keys in sorted(
+            (self._matching_keys(token, prefix) for token in tokens), key=len
+        ):
+            matches = keys if matches is None else matches & keys
+            if not matches:
+                return []
+
+        results = []
+        for key in matches or ():
+            outage = self._outages[key]
+            if (start is not None and outage.end <= start) or (
+                end is not None and outage.start >= end
+            ):
+                continue
+            results.append(AddressMatch(key[0], self._bill_ids[key[0]], outage))
+
+        results.sort(key=lambda match: (match.outage.start, match.bill_id))
+        return results
+
+    def _matching_keys(self, token: str, prefix: bool) -> Set[_DocKey]:
+        """Return the outage keys of a token, or of every token it starts."""
+        if not prefix:
+            return set(self._postings.get(token, ()))
+
+        keys: Set[_DocKey] = set()
+        vocabulary = self._vocabulary
+        position = bisect.bisect_left(vocabulary, token)
+        while position < len(vocabulary) and vocabulary[position].startswith(token):
+            keys.update(self._postings[vocabulary[position]])
+            position += 1
+        return keys
+
+    def _add(self, key: _DocKey, outage: Outage) -> None:
+        """Index one outage."""
+        self._outages[key] = outage
+        for token in tokenize(outage.address):
+            if (postings := self._postings.get(token)) is None:
+                postings = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+            postings.add(key)
+
+    def _remove(self, key: _DocKey) -> None:
+        """Remove one outage from the index."""
+        outage = self._outages.pop(key)
+        for token in tokenize(outage.address):
+            postings = self._postings[token]
+            postings.discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+
+@callback
+def async_get_address_index(hass: HomeAssistant) -> PlannedBlackoutsAddressIndex:
+    """Return the shared address index, creating it on first use."""
+    if (index := hass.data.get(DATA_ADDRESS_INDEX)) is None:
+        index = hass.data[DATA_ADDRESS_INDEX] = PlannedBlackoutsAddressIndex()
+    return index
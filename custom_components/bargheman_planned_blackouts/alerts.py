@@ -0,0 +1,129 @@
+"""Pre-outage alert events for Planned Blackouts."""
+from __future__ import annotations
+
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_BILL_ID,
+    ATTR_LEAD_TIME,
+    ATTR_OUTAGE_ADDRESS,
+    ATTR_OUTAGE_END,
+    ATTR_OUTAGE_NUMBER,
+    ATTR_OUTAGE_REASON,
+    ATTR_OUTAGE_START,
+    DATA_ALERTS,
+    EVENT_UPCOMING_OUTAGE,
+)
+from .models import Outage, outage_key
+from .timers import TimerHeap
+
+_LOGGER = logging.getLogger(__name__)
+
+# (outage key, lead time in minutes)
+_AlertKey = Tuple[Hashable, int]
+# (when, sequence, entry_id, key)
+_Alert = Tuple[datetime, int, str, _AlertKey]
+
+
+class PlannedBlackoutsAlertScheduler:
+    """Fire an event ahead of every outage of every config entry.
+
+    All pending alerts sit in one TimerHeap. When the outages of an entry
+    change, only the alerts that appeared are pushed; alerts that
+    disappeared are removed from the entry's pending set and skipped when
+    they surface.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._timers: TimerHeap[_Alert] = TimerHeap(
+            hass, self._is_live, self._async_fire_due
+        )
+        self._sequence = itertools.count()
+        # entry_id -> alert key -> outage, for alerts that have not fired
+        self._pending: Dict[str, Dict[_AlertKey, Outage]] = {}
+        self._bill_ids: Dict[str, str] = {}
+
+    @callback
+    def async_update(
+        self,
+        entry_id: str,
+        bill_id: str,
+        outages: Iterable[Outage],
+        lead_times: Iterable[int],
+    ) -> None:
+        """Bring the alerts of an entry in line with its current outages."""
+        now = dt_util.utcnow()
+        wanted: Dict[_AlertKey, Outage] = {}
+        for outage in outages:
+            for lead_time in lead_times:
+                if outage.start - timedelta(minutes=lead_time) > now:
+                    wanted[(outage_key(outage), lead_time)] = outage
+
+        pending = self._pending.setdefault(entry_id, {})
+        for key in wanted.keys() - pending.keys():
+            when = dt_util.as_utc(wanted[key].start - timedelta(minutes=key[1]))
+            self._timers.push((when, next(self._sequence), entry_id, key))
+
+        # Updating in place keeps reasons and addresses current for alerts
+        # that were already queued
+        pending.clear()
+        pending.update(wanted)
+        self._bill_ids[entry_id] = bill_id
+
+        self._timers.async_rearm(self._live_count())
+
+    @callback
+    def async_cancel(self, entry_id: str) -> None:
+        """Forget the alerts of an unloaded entry."""
+        self._pending.pop(entry_id, None)
+        self._bill_ids.pop(entry_id, None)
+        self._timers.async_rearm(self._live_count())
+
+    def _live_count(self) -> int:
+        """Return how many alerts have yet to fire."""
+        return sum(len(pending) for pending in self._pending.values())
+
+    def _is_live(self, alert: _Alert) -> bool:
+        """Return True if a heap item is still pending for its entry."""
+        return alert[3] in self._pending.get(alert[2], {})
+
+    @callback
+    def _async_fire_due(self, alerts: List[_Alert]) -> None:
+        """Fire the events of every alert that is due."""
+        for _, _, entry_id, key in alerts:
+            # Popping the key keeps a re-queued duplicate from firing twice
+            if (outage := self._pending.get(entry_id, {}).pop(key, None)) is None:
+                continue
+
+            _LOGGER.debug(
+                "Outage %s starts in %s minutes", outage.outage_number, key[1]
+            )
+            self._hass.bus.async_fire(
+                EVENT_UPCOMING_OUTAGE,
+                {
+                    "entry_id": entry_id,
+                    ATTR_BILL_ID: self._bill_ids[entry_id],
+                    ATTR_LEAD_TIME: key[1],
+                    ATTR_OUTAGE_START: outage.start.isoformat(),
+                    ATTR_OUTAGE_END: outage.end.isoformat(),
+                    ATTR_OUTAGE_REASON: outage.reason,
+                    ATTR_OUTAGE_ADDRESS: outage.address,
+                    ATTR_OUTAGE_NUMBER: outage.outage_number,
+                },
+            )
+
+
+@callback
+def async_get_alerts(hass: HomeAssistant) -> PlannedBlackoutsAlertScheduler:
+    """Return the shared alert scheduler, creating it on first use."""
+    if (alerts := hass.data.get(DATA_ALERTS)) is None:
+        alerts = hass.data[DATA_ALERTS] = PlannedBlackoutsAlertScheduler(hass)
+    return alerts
@@ -1,61 +1,280 @@
 """API client for SAAPA Planned Blackouts."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import aiohttp
-import jdatetime
 from aiohttp import ClientSession
 
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
-from .const import API_TIMEOUT, API_URL
+from .const import (
+    API_TIMEOUT,
+    COALESCE_MEMO_TTL,
+    DAY_CACHE_FAR_TTL,
+    DAY_CACHE_NEAR_DAYS,
+    DAY_CACHE_NEAR_TTL,
+    OUTAGE_TIME_ZONE,
+    RETRY_ATTEMPTS,
+    STREAM_CHUNK_SIZE,
+    STREAMING_THRESHOLD,
+)
+from .coalesce import RequestCoalescer
+from .models import Outage
+from .providers import PlannedBlackoutsProvider, SaapaProvider
+from .ratelimit import TokenBucket
+from .resilience import backoff_delay
+from .streaming import JsonArrayStreamParser
+from .metrics import (
+    COUNTER_OUTAGES_PROCESSED,
+    COUNTER_REQUEST_ERRORS,
+    COUNTER_REQUESTS,
+    COUNTER_REQUESTS_COALESCED,
+    METRIC_FETCH_LATENCY,
+    METRIC_JSON_DECODE,
+    METRIC_PARSE_PER_OUTAGE,
+    METRIC_PAYLOAD_BYTES,
+    METRIC_PROCESS_RESPONSE,
+    PlannedBlackoutsMetrics,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+_OUTAGE_TZ = dt_util.get_time_zone(OUTAGE_TIME_ZONE)
+
+# Statuses worth retrying; any other non-200 status fails right away
+_TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504}
+
 
 class PlannedBlackoutsApiClient:
-    """API client for SAAPA Planned Blackouts."""
+    """API client for the planned blackouts of a bill.
+
+    Fetches from SAAPA unless given other providers, in which case every
+    range is fetched from all of them concurrently and merged.
+    """
 
     def __init__(
-        self, session: ClientSession, token: str, bill_id: str
+        self,
+        session: ClientSession,
+        token: str,
+        bill_id: str,
+        providers: Optional[Sequence[PlannedBlackoutsProvider]] = None,
+        metrics: Optional[PlannedBlackoutsMetrics] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        rate_limiter: Optional[TokenBucket] = None,
     ) -> None:
         """Initialize the API client."""
         self._session = session
         self._token = token
         self._bill_id = bill_id
+        self._providers = list(providers or [SaapaProvider()])
+        self._metrics = metrics or PlannedBlackoutsMetrics()
+        self._coalescer = coalescer or RequestCoalescer(
+            COALESCE_MEMO_TTL.total_seconds()
+        )
+        self._rate_limiter = rate_limiter
+        # Per-day response cache: day -> (monotonic fetch time, outages)
+        self._day_cache: Dict[date, Tuple[float, List[Outage]]] = {}
 
     async def async_get_outages(
         self, from_date: datetime, to_date: datetime
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Outage]:
         """Get planned outages from the API.
         
-        Converts dates to Shamsi format, makes the API request,
-        and returns processed outage data with Gregorian dates.
+        Responses are cached per day. Only days that are new or whose
+        cached copy is older than their TTL are requested again, grouped
+        into contiguous ranges, and merged with the cached days.
+
+        Raises PlannedBlackoutsApiError if a range could not be fetched.
+        """
+        first_day = from_date.astimezone(_OUTAGE_TZ).date()
+        last_day = to_date.astimezone(_OUTAGE_TZ).date()
+        for provider in self._providers:
+            provider.prepare_window(first_day, last_day)
+        days = [
+            first_day + timedelta(days=offset)
+            for offset in range((last_day - first_day).days + 1)
+        ]
+
+        # Forget days that have slid out of the window
+        for day in [day for day in self._day_cache if day < first_day]:
+            del self._day_cache[day]
+
+        for run_start, run_end in self._stale_runs(days, first_day):
+            outages = await self._async_fetch_range(run_start, run_end)
+            fetched_at = time.monotonic()
+            by_day: Dict[date, List[Outage]] = {
+                run_start + timedelta(days=offset): []
+                for offset in range((run_end - run_start).days + 1)
+            }
+            for outage in outages:
+                day_outages = by_day.get(outage.start.date())
+                if day_outages is not None:
+                    day_outages.append(outage)
+            for day, day_outages in by_day.items():
+                self._day_cache[day] = (fetched_at, day_outages)
+
+        return [
+            outage
+            for day in days
+            if day in self._day_cache
+            for outage in self._day_cache[day][1]
+        ]
+
+    async def async_fetch_days(self, first_day: date, last_day: date) -> List[Outage]:
+        """Fetch the outages of a range of days, bypassing the day cache.
+
+        Days are Iran local dates. Used for ranges outside the polled window.
+        """
+        return await self._async_fetch_range(first_day, last_day)
+
+    def _stale_runs(self, days: List[date], today: date) -> List[Tuple[date, date]]:
+        """Group the days needing a fetch into contiguous (start, end) runs."""
+        now = time.monotonic()
+        runs: List[Tuple[date, date]] = []
+
+        for day in days:
+            cached = self._day_cache.get(day)
+            ttl = (
+                DAY_CACHE_NEAR_TTL
+                if (day - today).days < DAY_CACHE_NEAR_DAYS
+                else DAY_CACHE_FAR_TTL
+            )
+            if cached is not None and now - cached[0] < ttl.total_seconds():
+                continue
+
+            if runs and runs[-1][1] == day - timedelta(days=1):
+                runs[-1] = (runs[-1][0], day)
+            else:
+                runs.append((day, day))
+
+        return runs
+
+    async def _async_fetch_range(self, from_date: date, to_date: date) -> List[Outage]:
+        """Fetch a date range from every provider concurrently.
+
+        A provider that fails or misses its deadline is left out with a
+        warning, so it cannot hold up the others. The range only fails if
+        every provider failed, with the error of the first one.
+        """
+        if len(self._providers) == 1:
+            return await self._async_fetch_from(self._providers[0], from_date, to_date)
+
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_from(provider, from_date, to_date)
+                for provider in self._providers
+            ),
+            return_exceptions=True,
+        )
+
+        outages: Dict[Outage, None] = {}
+        errors: List[Exception] = []
+        for provider, result in zip(self._providers, results):
+            if isinstance(result, (ConfigEntryAuthFailed, PlannedBlackoutsApiError)):
+                _LOGGER.warning("Error fetching from %s: %s", provider.name, result)
+                errors.append(result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                # Providers covering the same area may report the same outage
+                outages.update(dict.fromkeys(result))
+
+        if len(errors) == len(self._providers):
+            raise errors[0]
+        return sorted(outages, key=lambda outage: outage.start)
+
+    async def _async_fetch_from(
+        self, provider: PlannedBlackoutsProvider, from_date: date, to_date: date
+    ) -> List[Outage]:
+        """Request a date range from one provider, sharing identical requests.
+
+        Callers asking for the same bill and dates while a request is in
+        flight, or shortly after one succeeded, get its result instead of
+        sending a request of their own.
         """
-        
-        # Convert dates to Shamsi format (YYYY/MM/DD)
-        from_date_shamsi = self._convert_to_shamsi(from_date)
-        to_date_shamsi = self._convert_to_shamsi(to_date)
-        
-        # Prepare request payload
-        payload = {
-            "bill_id": self._bill_id,
-            "from_date": from_date_shamsi,
-            "to_date": to_date_shamsi,
-        }
-        
-        # Prepare headers
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self._token}",
-        }
-        
+        try:
+            outages, shared = await asyncio.wait_for(
+                self._coalescer.async_run(
+                    (provider.url, self._token, self._bill_id, from_date, to_date),
+                    lambda: self._async_fetch_with_retries(
+                        provider, from_date, to_date
+                    ),
+                ),
+                provider.timeout,
+            )
+        except asyncio.TimeoutError as err:
+            raise PlannedBlackoutsApiError(
+                f"{provider.name} did not answer within {provider.timeout} seconds"
+            ) from err
+
+        if shared:
+            self._metrics.increment(COUNTER_REQUESTS_COALESCED)
+        return list(outages)
+
+    async def _async_fetch_with_retries(
+        self, provider: PlannedBlackoutsProvider, from_date: date, to_date: date
+    ) -> List[Outage]:
+        """Request a date range from a provider, retrying transient failures.
+
+        Failed attempts are retried with jittered exponential backoff. The
+        circuit breaker shared by all clients of the provider refuses to send
+        anything while it keeps failing.
+        """
+        circuit_breaker = provider.circuit_breaker
+        for attempt in range(RETRY_ATTEMPTS):
+            if not circuit_breaker.allow_request():
+                raise PlannedBlackoutsApiError(
+                    f"{provider.name} is failing, requests are paused until it "
+                    "recovers"
+                )
+
+            try:
+                outages = await self._async_request_range(provider, from_date, to_date)
+            except _TransientApiError as err:
+                self._metrics.increment(COUNTER_REQUEST_ERRORS)
+                circuit_breaker.record_failure()
+                if attempt + 1 == RETRY_ATTEMPTS:
+                    raise PlannedBlackoutsApiError(
+                        f"Giving up after {RETRY_ATTEMPTS} attempts: {err}"
+                    ) from err
+
+                delay = backoff_delay(attempt)
+                _LOGGER.debug("Retrying in %.1f seconds after error: %s", delay, err)
+                await asyncio.sleep(delay)
+            except (ConfigEntryAuthFailed, PlannedBlackoutsApiError):
+                # The API answered, it just did not like the request
+                self._metrics.increment(COUNTER_REQUEST_ERRORS)
+                circuit_breaker.record_success()
+                raise
+            else:
+                circuit_breaker.record_success()
+                return outages
+
+        raise AssertionError("unreachable")
+
+    async def _async_request_range(
+        self, provider: PlannedBlackoutsProvider, from_date: date, to_date: date
+    ) -> List[Outage]:
+        """Send a single request for a date range to a provider."""
+        payload, headers = provider.build_request(
+            self._bill_id, self._token, from_date, to_date
+        )
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.async_acquire()
+
+        self._metrics.increment(COUNTER_REQUESTS)
+        started = time.perf_counter()
         try:
             async with self._session.post(
-                API_URL,
+                provider.url,
                 json=payload,
                 headers=headers,
                 timeout=API_TIMEOUT,
@@ -64,69 +283,116 @@ class PlannedBlackoutsApiClient:
                     raise ConfigEntryAuthFailed("Invalid authentication token")
                 
                 if response.status != 200:
-                    _LOGGER.error(
-                        "Error fetching data: %s - %s",
-                        response.status,
-                        await response.text(),
+                    message = (
+                        f"Error fetching data: {response.status} - "
+                        f"{await response.text()}"
                     )
-                    return []
-                
-                data = await response.json()
+                    if response.status in _TRANSIENT_STATUSES:
+                        raise _TransientApiError(message)
+                    raise PlannedBlackoutsApiError(message)
                 
-                # Process the response
-                return self._process_response(data)
+                # Large or unsized bodies are parsed while they stream in
+                if (
+                    response.content_length is None
+                    or response.content_length > STREAMING_THRESHOLD
+                ):
+                    return await self._async_process_stream(
+                        provider, response, started
+                    )
+
+                body = await response.read()
                 
-        except aiohttp.ClientError as err:
-            _LOGGER.error("Error connecting to API: %s", err)
-            return []
-    
-    def _convert_to_shamsi(self, date: datetime) -> str:
-        """Convert a Gregorian date to Shamsi format."""
-        shamsi_date = jdatetime.date.fromgregorian(date=date.date())
-        return shamsi_date.strftime("%Y/%m/%d")
-    
-    def _convert_from_shamsi(self, date_str: str, time_str: str) -> datetime:
-        """Convert Shamsi date and time to Gregorian datetime."""
-        shamsi_date = jdatetime.datetime.strptime(f"{date_str} {time_str}", "%Y/%m/%d %H:%M")
-        return shamsi_date.togregorian()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            raise _TransientApiError(f"Error connecting to API: {err!r}") from err
+        except ValueError as err:
+            # A maintenance or proxy page served with a 200 status
+            raise PlannedBlackoutsApiError(f"Invalid response body: {err}") from err
+
+        self._metrics.record(METRIC_FETCH_LATENCY, time.perf_counter() - started)
+        self._metrics.record(METRIC_PAYLOAD_BYTES, len(body))
+        with self._metrics.timer(METRIC_JSON_DECODE):
+            try:
+                data = json_loads(body)
+            except ValueError as err:
+                raise PlannedBlackoutsApiError(f"Invalid response body: {err}") from err
+
+        # Process the response
+        process_started = time.perf_counter()
+        outages = self._process_response(provider, data)
+        self._record_processing(outages, time.perf_counter() - process_started)
+        return outages
+
+    async def _async_process_stream(
+        self,
+        provider: PlannedBlackoutsProvider,
+        response: aiohttp.ClientResponse,
+        started: float,
+    ) -> List[Outage]:
+        """Turn the items of a streamed response into outages as they arrive."""
+        parser = JsonArrayStreamParser(provider.items_key)
+        outages: List[Outage] = []
+        payload_bytes = 0
+        process_time = 0.0
+
+        async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+            payload_bytes += len(chunk)
+            process_started = time.perf_counter()
+            for item in parser.feed(chunk):
+                if (outage := provider.parse_item(item)) is not None:
+                    outages.append(outage)
+            process_time += time.perf_counter() - process_started
+
+        process_started = time.perf_counter()
+        for item in parser.feed(b"", final=True):
+            if (outage := provider.parse_item(item)) is not None:
+                outages.append(outage)
+        process_time += time.perf_counter() - process_started
+
+        self._metrics.record(METRIC_FETCH_LATENCY, time.perf_counter() - started)
+        self._metrics.record(METRIC_PAYLOAD_BYTES, payload_bytes)
+        self._record_processing(outages, process_time)
+        return outages
+
+    def _record_processing(self, outages: List[Outage], seconds: float) -> None:
+        """Record how long turning a response into outages took."""
+        self._metrics.record(METRIC_PROCESS_RESPONSE, seconds)
+        if outages:
+            self._metrics.increment(COUNTER_OUTAGES_PROCESSED, len(outages))
+            self._metrics.record(METRIC_PARSE_PER_OUTAGE, seconds / len(outages))
     
-    def _process_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _process_response(
+        self, provider: PlannedBlackoutsProvider, data: Dict[str, Any]
+    ) -> List[Outage]:
         """Process the API response and convert dates."""
         outages = []
         
+        if not isinstance(data, dict):
+            raise PlannedBlackoutsApiError(
+                "Invalid response body: expected a JSON object, got "
+                f"{type(data).__name__}"
+            )
+
         # Check if data contains the expected structure
-        if not data or "data" not in data:
+        if not data or provider.items_key not in data:
             return outages
         
-        for outage in data.get("data", []):
-            # Extract all required fields
-            outage_date = outage.get("outage_date")
-            start_time = outage.get("outage_start_time")
-            end_time = outage.get("outage_stop_time")
-            reason = outage.get("reason_outage")
-            address = outage.get("address")
-            outage_number = outage.get("outage_number")
-            
-            # Skip if any required field is missing
-            if not all([outage_date, start_time, end_time]):
-                _LOGGER.warning("Skipping outage with missing required fields: %s", outage)
-                continue
-            
-            try:
-                # Convert date and times to Gregorian
-                start_datetime = self._convert_from_shamsi(outage_date, start_time)
-                end_datetime = self._convert_from_shamsi(outage_date, end_time)
-                
-                processed_outage = {
-                    "start": start_datetime,
-                    "end": end_datetime,
-                    "reason": reason or "Unknown reason",
-                    "address": address or "Unknown location",
-                    "outage_number": outage_number or "",
-                }
-                
-                outages.append(processed_outage)
-            except (ValueError, TypeError) as err:
-                _LOGGER.error("Error processing outage data: %s - %s", err, outage)
+        items = data[provider.items_key]
+        if not isinstance(items, list):
+            raise PlannedBlackoutsApiError(
+                "Invalid response body: expected a JSON array under "
+                f"{provider.items_key!r}, got {type(items).__name__}"
+            )
+
+        for item in items:
+            if (outage := provider.parse_item(item)) is not None:
+                outages.append(outage)
         
         return outages
+
+
+class PlannedBlackoutsApiError(HomeAssistantError):
+    """Error to indicate the API request failed."""
+
+
+class _TransientApiError(PlannedBlackoutsApiError):
+    """Error to indicate a request failure that may succeed when retried."""
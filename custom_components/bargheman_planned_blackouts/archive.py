@@ -0,0 +1,237 @@
+"""Local outage history archive for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional, Tuple
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_FILENAME,
+    ARCHIVE_FLUSH_DELAY,
+    DATA_ARCHIVE,
+    OUTAGE_TIME_ZONE,
+)
+from .models import Outage, intern_text
+
+_LOGGER = logging.getLogger(__name__)
+
+_OUTAGE_TZ = dt_util.get_time_zone(OUTAGE_TIME_ZONE)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS outages (
+        bill_id TEXT NOT NULL,
+        outage_number TEXT NOT NULL,
+        start_ts INTEGER NOT NULL,
+        end_ts INTEGER NOT NULL,
+        reason TEXT NOT NULL,
+        address TEXT NOT NULL,
+        PRIMARY KEY (bill_id, outage_number, start_ts, address)
+    ) WITHOUT ROWID
+    """,
+    # Covers range lookups and the history aggregates of a bill
+    "CREATE INDEX IF NOT EXISTS outages_bill_time "
+    "ON outages (bill_id, start_ts, end_ts)",
+    "CREATE INDEX IF NOT EXISTS outages_address_time "
+    "ON outages (address, start_ts)",
+)
+
+# Stored in PRAGMA user_version. Version 1 adds the address to the primary
+# key, which tells apart outages reported at the same time without a number.
+_SCHEMA_VERSION = 1
+_INDEXES = ("outages_bill_time", "outages_address_time")
+
+# (bill_id, outage_number, start_ts, end_ts, reason, address)
+_Row = Tuple[str, str, int, int, str, str]
+
+
+class OutageHistory(NamedTuple):
+    """Aggregate statistics over archived outages."""
+
+    count: int
+    mean_duration: Optional[timedelta]
+
+
+class PlannedBlackoutsArchive:
+    """SQLite archive of every processed outage, shared by all config entries.
+
+    Refreshes queue their outages and the archive writes them in batches,
+    in one transaction per batch. All database access runs in the executor.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        """Initialize the archive."""
+        self._hass = hass
+        self._path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        # The connection is used from whichever executor thread runs a job
+        self._lock = threading.Lock()
+        self._pending: List[_Row] = []
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_handle_final_write
+        )
+
+    @callback
+    def async_queue(self, bill_id: str, outages: List[Outage]) -> None:
+        """Queue processed outages to be written with the next batch."""
+        self._pending.extend(
+            (
+                bill_id,
+                outage.outage_number,
+                int(outage.start.timestamp()),
+                int(outage.end.timestamp()),
+                outage.reason,
+                outage.address,
+            )
+            for outage in outages
+        )
+
+        if len(self._pending) >= ARCHIVE_BATCH_SIZE:
+            self._hass.async_create_task(self.async_flush())
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, ARCHIVE_FLUSH_DELAY, self._async_flush_later
+            )
+
+    async def _async_flush_later(self, _now: datetime) -> None:
+        """Write the pending batch once the flush delay has passed."""
+        self._unsub_flush = None
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write all pending outages in one transaction."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if not self._pending:
+            return
+
+        rows, self._pending = self._pending, []
+        try:
+            await self._hass.async_add_executor_job(self._write, rows)
+        except sqlite3.Error as err:
+            _LOGGER.error(
+                "Error writing %s outages to the archive: %s", len(rows), err
+            )
+
+    async def async_get_outages(
+        self, bill_id: str, start: datetime, end: datetime
+    ) -> List[Outage]:
+        """Return the archived outages of a bill overlapping start..end."""
+        rows = await self._hass.async_add_executor_job(
+            self._query,
+            "SELECT outage_number, start_ts, end_ts, reason, address FROM outages "
+            "WHERE bill_id = ? AND start_ts < ? AND end_ts > ? ORDER BY start_ts",
+            (bill_id, int(end.timestamp()), int(start.timestamp())),
+        )
+        return [
+            Outage(
+                start=datetime.fromtimestamp(start_ts, _OUTAGE_TZ),
+                end=datetime.fromtimestamp(end_ts, _OUTAGE_TZ),
+                reason=intern_text(reason),
+                address=intern_text(address),
+                outage_number=outage_number,
+            )
+            for outage_number, start_ts, end_ts, reason, address in rows
+        ]
+
+    async def async_get_history(
+        self, bill_id: str, start: datetime, end: datetime
+    ) -> OutageHistory:
+        """Return statistics over the archived outages starting in start..end."""
+        ((count, mean_seconds),) = await self._hass.async_add_executor_job(
+            self._query,
+            "SELECT COUNT(*), AVG(end_ts - start_ts) FROM outages "
+            "WHERE bill_id = ? AND start_ts >= ? AND start_ts < ?",
+            (bill_id, int(start.timestamp()), int(end.timestamp())),
+        )
+        return OutageHistory(
+            count=count,
+            mean_duration=(
+                timedelta(seconds=mean_seconds) if mean_seconds is not None else None
+            ),
+        )
+
+    async def async_remove_bill(self, bill_id: str) -> None:
+        """Delete the archived outages of a bill."""
+        self._pending = [row for row in self._pending if row[0] != bill_id]
+        await self._hass.async_add_executor_job(
+            self._execute, "DELETE FROM outages WHERE bill_id = ?", (bill_id,)
+        )
+
+    async def _async_handle_final_write(self, _event: Event) -> None:
+        """Write pending outages and close the database on shutdown."""
+        await self.async_flush()
+        await self._hass.async_add_executor_job(self._close)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create its schema on first use."""
+        if self._connection is None:
+            connection = sqlite3.connect(self._path, check_same_thread=False)
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            with connection:
+                if version < _SCHEMA_VERSION:
+                    self._migrate(connection)
+                for statement in _SCHEMA:
+                    connection.execute(statement)
+                connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self._connection = connection
+        return self._connection
+
+    @staticmethod
+    def _migrate(connection: sqlite3.Connection) -> None:
+        """Rebuild an archive of an older schema with the current primary key."""
+        exists = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'outages'"
+        ).fetchone()
+        if not exists:
+            return
+
+        for index in _INDEXES:
+            connection.execute(f"DROP INDEX IF EXISTS {index}")
+        connection.execute("ALTER TABLE outages RENAME TO outages_old")
+        connection.execute(_SCHEMA[0])
+        connection.execute("INSERT INTO outages SELECT * FROM outages_old")
+        connection.execute("DROP TABLE outages_old")
+
+    def _write(self, rows: List[_Row]) -> None:
+        """Insert or update a batch of outages."""
+        with self._lock, self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO outages VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def _query(self, sql: str, parameters: Tuple) -> List[Tuple]:
+        """Run a read query and return all rows."""
+        with self._lock:
+            return self._connect().execute(sql, parameters).fetchall()
+
+    def _execute(self, sql: str, parameters: Tuple) -> None:
+        """Run a write statement in its own transaction."""
+        with self._lock, self._connect() as connection:
+            connection.execute(sql, parameters)
+
+    def _close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+@callback
+def async_get_archive(hass: HomeAssistant) -> PlannedBlackoutsArchive:
+    """Return the shared outage archive, creating it on first use."""
+    if (archive := hass.data.get(DATA_ARCHIVE)) is None:
+        archive = PlannedBlackoutsArchive(hass, hass.config.path(ARCHIVE_FILENAME))
+        hass.data[DATA_ARCHIVE] = archive
+    return archive
@@ -0,0 +1,82 @@
+"""Binary sensor platform for Planned Blackouts integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import (
+    ATTR_OUTAGE_ADDRESS,
+    ATTR_OUTAGE_END,
+    ATTR_OUTAGE_NUMBER,
+    ATTR_OUTAGE_REASON,
+    BINARY_SENSOR_OUTAGE_ACTIVE,
+    DOMAIN,
+)
+from .coordinator import PlannedBlackoutsDataUpdateCoordinator
+from .entity import PlannedBlackoutsEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+OUTAGE_ACTIVE_DESCRIPTION = BinarySensorEntityDescription(
+    key=BINARY_SENSOR_OUTAGE_ACTIVE,
+    name="Planned Outage Active",
+    icon="mdi:transmission-tower-off",
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Planned Blackouts binary sensor platform."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        [PlannedBlackoutsOutageActiveSensor(coordinator, OUTAGE_ACTIVE_DESCRIPTION)],
+        True,
+    )
+
+
+class PlannedBlackoutsOutageActiveSensor(PlannedBlackoutsEntity, BinarySensorEntity):
+    """Binary sensor that is on while a planned outage is in progress."""
+
+    def __init__(
+        self,
+        coordinator: PlannedBlackoutsDataUpdateCoordinator,
+        description: BinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_name = description.name
+        self._data_parts = frozenset({"active_outage"})
+
+    @property
+    def is_on(self) -> Optional[bool]:
+        """Return True if an outage is in progress."""
+        if not self.coordinator.data:
+            return None
+
+        return self.coordinator.data.active_outage is not None
+
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build the details of the outage in progress."""
+        attrs = {}
+        if self.coordinator.data and self.coordinator.data.active_outage:
+            active_outage = self.coordinator.data.active_outage
+            attrs[ATTR_OUTAGE_END] = active_outage.end.isoformat()
+            attrs[ATTR_OUTAGE_REASON] = active_outage.reason
+            attrs[ATTR_OUTAGE_ADDRESS] = active_outage.address
+            attrs[ATTR_OUTAGE_NUMBER] = active_outage.outage_number
+
+        return attrs
@@ -2,17 +2,30 @@
 from __future__ import annotations
 
 import logging
+import sqlite3
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from homeassistant.components.calendar import CalendarEntity, CalendarEvent
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryAuthFailed
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
-from .const import CALENDAR_NAME, DOMAIN
-from . import PlannedBlackoutsDataUpdateCoordinator
+from .api import PlannedBlackoutsApiError
+from .const import (
+    CALENDAR_NAME,
+    CONF_BILL_ID,
+    CONF_DAYS_AHEAD,
+    DEFAULT_DAYS_AHEAD,
+    DOMAIN,
+)
+from .coordinator import PART_CALENDAR_EVENT, PlannedBlackoutsDataUpdateCoordinator
+from .entity import PlannedBlackoutsEntity
+from .index import OutageIndex
+from .intervals import merge_outages
+from .models import outage_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,7 +41,7 @@ async def async_setup_entry(
     async_add_entities([PlannedBlackoutsCalendar(coordinator)], True)
 
 
-class PlannedBlackoutsCalendar(CoordinatorEntity, CalendarEntity):
+class PlannedBlackoutsCalendar(PlannedBlackoutsEntity, CalendarEntity):
     """Calendar entity for Planned Blackouts."""
 
     def __init__(self, coordinator: PlannedBlackoutsDataUpdateCoordinator) -> None:
@@ -36,61 +49,73 @@ class PlannedBlackoutsCalendar(CoordinatorEntity, CalendarEntity):
         super().__init__(coordinator)
         self._attr_name = CALENDAR_NAME
         self._attr_unique_id = f"{coordinator.entry.entry_id}_calendar"
+        self._data_parts = frozenset({PART_CALENDAR_EVENT})
         
     @property
     def event(self) -> Optional[CalendarEvent]:
-        """Return the next upcoming event."""
-        if not self.coordinator.data or not self.coordinator.data.get("outages"):
+        """Return the current or next upcoming event."""
+        if not self.coordinator.data:
             return None
         
-        now = datetime.now()
-        current_or_next_event = None
-        
-        # Find current or next event
-        for outage in self.coordinator.data["outages"]:
-            start = outage["start"]
-            end = outage["end"]
-            
-            # Check if this is a current event
-            if start <= now <= end:
-                current_or_next_event = outage
-                break
-            
-            # Check if this is a future event and earlier than any previously found
-            if start > now and (current_or_next_event is None or start < current_or_next_event["start"]):
-                current_or_next_event = outage
-        
-        if current_or_next_event:
-            return CalendarEvent(
-                start=current_or_next_event["start"],
-                end=current_or_next_event["end"],
-                summary=f"Power Outage: {current_or_next_event['address']}",
-                description=current_or_next_event["reason"],
-            )
-        
-        return None
+        return self.coordinator.data.index.current_or_next(dt_util.now())
 
     async def async_get_events(
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> List[CalendarEvent]:
         """Get all events in a specific time frame."""
-        if not self.coordinator.data or not self.coordinator.data.get("outages"):
+        if not self.coordinator.data:
             return []
         
-        events = []
-        for outage in self.coordinator.data["outages"]:
-            event_start = outage["start"]
-            event_end = outage["end"]
-            
-            # Check if event is in the requested date range
-            if event_end >= start_date and event_start <= end_date:
-                events.append(
-                    CalendarEvent(
-                        start=event_start,
-                        end=event_end,
-                        summary=f"Power Outage: {outage['address']}",
-                        description=outage["reason"],
-                    )
-                )
-        
-        return events
+        events = self.coordinator.data.index.between(start_date, end_date)
+        today_start = dt_util.start_of_local_day()
+
+        # Days after the polled window are fetched on demand
+        entry_data = self.coordinator.entry.data
+        days_ahead = entry_data.get(CONF_DAYS_AHEAD, DEFAULT_DAYS_AHEAD)
+        window_end = dt_util.start_of_local_day(
+            today_start.date() + timedelta(days=days_ahead + 1)
+        )
+        if end_date > window_end:
+            events += await self._async_get_upcoming_events(
+                max(start_date, window_end), end_date
+            )
+
+        # Days before today have left the fetched window, look them up in the
+        # archive instead
+        if start_date >= today_start:
+            return events
+
+        try:
+            archived = await self.coordinator.archive.async_get_outages(
+                self.coordinator.entry.data[CONF_BILL_ID],
+                start_date,
+                min(end_date, today_start),
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Error reading the outage archive: %s", err)
+            return events
+
+        fetched = {outage_key(outage) for outage in self.coordinator.data.outages}
+        past = merge_outages(
+            outage for outage in archived if outage_key(outage) not in fetched
+        )
+        return OutageIndex(past).between(start_date, end_date) + events
+
+    async def _async_get_upcoming_events(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[CalendarEvent]:
+        """Fetch the events of a range beyond the polled window."""
+        try:
+            outages = await self.coordinator.engine.async_fetch_range(
+                self.coordinator.entry.entry_id, start_date, end_date
+            )
+        except (PlannedBlackoutsApiError, ConfigEntryAuthFailed, KeyError) as err:
+            # Show the polled events rather than failing the whole request
+            _LOGGER.warning("Error fetching outages after %s: %s", start_date, err)
+            return []
+
+        fetched = {outage_key(outage) for outage in self.coordinator.data.outages}
+        upcoming = merge_outages(
+            outage for outage in outages if outage_key(outage) not in fetched
+        )
+        return OutageIndex(upcoming).between(start_date, end_date)
@@ -0,0 +1,71 @@
+"""Single-flight coalescing of SAAPA API requests."""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import COALESCE_MEMO_TTL, DATA_COALESCER
+
+
+class RequestCoalescer:
+    """Share identical requests between concurrent and closely spaced callers.
+
+    The first caller for a key starts the request; callers arriving while it
+    is in flight await the same request. Successful results are remembered
+    for memo_ttl seconds so a burst of identical calls sends only one request.
+    """
+
+    def __init__(self, memo_ttl: float) -> None:
+        """Initialize the coalescer."""
+        self._memo_ttl = memo_ttl
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        # key -> (monotonic completion time, result)
+        self._memo: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def async_run(
+        self, key: Hashable, request: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Return the result for key and whether it came from another caller."""
+        now = time.monotonic()
+        if (memo := self._memo.get(key)) is not None:
+            if now - memo[0] < self._memo_ttl:
+                return memo[1], True
+            del self._memo[key]
+
+        if (task := self._in_flight.get(key)) is not None:
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(request())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda task: self._finish(key, task))
+        # A cancelled caller must not cancel the request the others await
+        return await asyncio.shield(task), False
+
+    @callback
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        """Forget a finished request and remember its result if it succeeded."""
+        del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        now = time.monotonic()
+        for stale in [
+            stale
+            for stale, (finished_at, _) in self._memo.items()
+            if now - finished_at >= self._memo_ttl
+        ]:
+            del self._memo[stale]
+        self._memo[key] = (now, task.result())
+
+
+@callback
+def async_get_coalescer(hass: HomeAssistant) -> RequestCoalescer:
+    """Return the shared request coalescer, creating it on first use."""
+    if (coalescer := hass.data.get(DATA_COALESCER)) is None:
+        coalescer = hass.data[DATA_COALESCER] = RequestCoalescer(
+            COALESCE_MEMO_TTL.total_seconds()
+        )
+    return coalescer
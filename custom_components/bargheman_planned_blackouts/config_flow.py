@@ -2,28 +2,46 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResult
-from homeassistant.exceptions import HomeAssistantError
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
 
+from . import jalali
 from .api import PlannedBlackoutsApiClient
+from .coalesce import async_get_coalescer
 from .const import (
+    ABSOLUTE_MIN_POLLING_INTERVAL,
+    CONF_ALERT_LEAD_TIMES,
     CONF_API_TOKEN,
     CONF_BILL_ID,
     CONF_DAYS_AHEAD,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_INTERVAL,
     CONF_POLLING_INTERVAL,
+    CONF_PROVIDERS,
+    CONF_REPORT_URLS,
+    DEFAULT_ALERT_LEAD_TIMES,
     DEFAULT_DAYS_AHEAD,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MIN_POLLING_INTERVAL,
     DEFAULT_POLLING_INTERVAL,
+    DEFAULT_PROVIDERS,
     DOMAIN,
+    MAX_ALERT_LEAD_TIME,
     MAX_DAYS_AHEAD,
     MIN_POLLING_INTERVAL,
 )
+from .providers import PROVIDERS, report_url_provider
+from .ratelimit import async_get_rate_limiter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,28 +55,71 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Optional(CONF_POLLING_INTERVAL, default=DEFAULT_POLLING_INTERVAL): vol.All(
             vol.Coerce(int), vol.Range(min=MIN_POLLING_INTERVAL)
         ),
+        vol.Optional(
+            CONF_MIN_POLLING_INTERVAL, default=DEFAULT_MIN_POLLING_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=ABSOLUTE_MIN_POLLING_INTERVAL)),
+        vol.Optional(
+            CONF_MAX_POLLING_INTERVAL, default=DEFAULT_MAX_POLLING_INTERVAL
+        ): vol.All(vol.Coerce(int), vol.Range(min=MIN_POLLING_INTERVAL)),
+        vol.Optional(
+            CONF_ALERT_LEAD_TIMES,
+            default=", ".join(str(minutes) for minutes in DEFAULT_ALERT_LEAD_TIMES),
+        ): str,
+        vol.Optional(CONF_PROVIDERS, default=DEFAULT_PROVIDERS): vol.All(
+            cv.multi_select(list(PROVIDERS)), vol.Length(min=1)
+        ),
+        vol.Optional(CONF_REPORT_URLS, default=""): str,
     }
 )
 
 
+def _parse_report_urls(text: str) -> List[str]:
+    """Parse comma separated report URLs.
+
+    Raises vol.Invalid if one is not an http or https URL.
+    """
+    urls = [cv.url(part.strip()) for part in text.split(",") if part.strip()]
+    return list(dict.fromkeys(urls))
+
+
+def _parse_lead_times(text: str) -> List[int]:
+    """Parse comma separated alert lead times in minutes, longest first.
+
+    Raises ValueError if a lead time is not a whole number of minutes in range.
+    """
+    lead_times = {int(part) for part in text.split(",") if part.strip()}
+    if any(not 0 < minutes <= MAX_ALERT_LEAD_TIME for minutes in lead_times):
+        raise ValueError(f"Lead times must be 1 to {MAX_ALERT_LEAD_TIME} minutes")
+    return sorted(lead_times, reverse=True)
+
+
 async def validate_input(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
     """
+    # No entry may have imported the Shamsi calendar yet on a fresh install
+    await hass.async_add_executor_job(jalali.load)
+
     # Validate the API token and bill ID by making a test API call
     api = PlannedBlackoutsApiClient(
         async_get_clientsession(hass),
         data[CONF_API_TOKEN],
         data[CONF_BILL_ID],
+        providers=[
+            PROVIDERS[name]() for name in data.get(CONF_PROVIDERS, DEFAULT_PROVIDERS)
+        ]
+        + [report_url_provider(url) for url in data.get(CONF_REPORT_URLS, [])],
+        coalescer=async_get_coalescer(hass),
+        rate_limiter=async_get_rate_limiter(hass),
     )
     
     try:
-        # Test API connection with a minimal date range
-        from datetime import datetime, timedelta
-        today = datetime.now()
-        tomorrow = today + timedelta(days=1)
-        await api.async_get_outages(today, tomorrow)
+        # Test API connection over the window the entry will poll, so its
+        # first refresh is answered from the coalesced result
+        today = dt_util.now()
+        days_ahead = data.get(CONF_DAYS_AHEAD, DEFAULT_DAYS_AHEAD)
+        await api.async_get_outages(today, today + timedelta(days=days_ahead))
     except ConfigEntryAuthFailed as exception:
         raise InvalidAuth from exception
     except Exception as exception:
@@ -78,7 +139,25 @@ class PlannedBlackoutsConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle the initial step."""
         errors: Dict[str, str] = {}
-        if user_input is not None:
+        if user_input is not None and user_input.get(
+            CONF_MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL
+        ) > user_input.get(CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL):
+            errors["base"] = "invalid_polling_bounds"
+        elif user_input is not None:
+            try:
+                user_input[CONF_ALERT_LEAD_TIMES] = _parse_lead_times(
+                    user_input.get(CONF_ALERT_LEAD_TIMES, "")
+                )
+            except ValueError:
+                errors[CONF_ALERT_LEAD_TIMES] = "invalid_lead_times"
+            try:
+                user_input[CONF_REPORT_URLS] = _parse_report_urls(
+                    user_input.get(CONF_REPORT_URLS, "")
+                )
+            except vol.Invalid:
+                errors[CONF_REPORT_URLS] = "invalid_report_urls"
+
+        if user_input is not None and not errors:
             try:
                 info = await validate_input(self.hass, user_input)
                 return self.async_create_entry(title=info["title"], data=user_input)
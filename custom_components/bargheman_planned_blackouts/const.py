@@ -1,13 +1,18 @@
 """Constants for the Planned Blackouts integration."""
 from datetime import timedelta
 
-DOMAIN = "planned_blackouts"
+DOMAIN = "bargheman_planned_blackouts"
 
 # Config flow
 CONF_BILL_ID = "bill_id"
 CONF_API_TOKEN = "api_token"
 CONF_DAYS_AHEAD = "days_ahead"
 CONF_POLLING_INTERVAL = "polling_interval"
+CONF_MIN_POLLING_INTERVAL = "min_polling_interval"
+CONF_MAX_POLLING_INTERVAL = "max_polling_interval"
+CONF_ALERT_LEAD_TIMES = "alert_lead_times"
+CONF_PROVIDERS = "providers"
+CONF_REPORT_URLS = "report_urls"
 
 # Defaults
 DEFAULT_DAYS_AHEAD = 7
@@ -15,15 +20,112 @@ DEFAULT_POLLING_INTERVAL = 3600
 MIN_POLLING_INTERVAL = 300
 MAX_DAYS_AHEAD = 14
 
+# Adaptive polling
+DEFAULT_MIN_POLLING_INTERVAL = 300
+DEFAULT_MAX_POLLING_INTERVAL = 21600
+ABSOLUTE_MIN_POLLING_INTERVAL = 60
+# Never wait longer than this fraction of the time left until the next outage
+PROXIMITY_FACTOR = 0.25
+MAX_BACKOFF_EXPONENT = 6
+
 # API
 API_URL = "https://uiapi.saapa.ir/api/ebills/PlannedBlackoutsReport"
 API_TIMEOUT = 10
 
+# Report providers, and the deadline for fetching a range, retries included
+PROVIDER_SAAPA = "saapa"
+DEFAULT_PROVIDERS = [PROVIDER_SAAPA]
+PROVIDER_TIMEOUT = 45
+# Outage dates and times are reported in Iran local time
+OUTAGE_TIME_ZONE = "Asia/Tehran"
+
+# Responses larger than this, or of unknown size, are parsed while streaming
+STREAMING_THRESHOLD = 64 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Retries and circuit breaker
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 10.0
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = timedelta(minutes=5)
+
+# Request coalescing
+DATA_COALESCER = f"{DOMAIN}_coalescer"
+COALESCE_MEMO_TTL = timedelta(seconds=30)
+
+# Domain-wide limit on requests to SAAPA, in requests per second
+DATA_RATE_LIMITER = f"{DOMAIN}_rate_limiter"
+API_RATE_LIMIT = 2.0
+API_RATE_BURST = 10
+
+# Fetch engine
+DATA_ENGINE = f"{DOMAIN}_engine"
+MAX_CONCURRENT_FETCHES = 4
+
+# On-demand fetching of ranges outside the polled window
+RANGE_CHUNK_DAYS = 14
+RANGE_CACHE_SIZE = 64
+RANGE_CACHE_TTL = timedelta(hours=3)
+
+# Outage lookup service
+SERVICE_GET_OUTAGES = "get_outages"
+ATTR_BILL_IDS = "bill_ids"
+ATTR_START_DATE = "start_date"
+ATTR_END_DATE = "end_date"
+LOOKUP_MAX_BILLS = 500
+LOOKUP_MAX_DAYS = 31
+LOOKUP_RATE = 2.0
+LOOKUP_BURST = 5
+DATA_LOOKUP_LIMITER = f"{DOMAIN}_lookup_limiter"
+# Coordinator data younger than this answers lookups without a request
+LOOKUP_MAX_DATA_AGE = timedelta(minutes=15)
+
+# Address search
+DATA_ADDRESS_INDEX = f"{DOMAIN}_address_index"
+SERVICE_SEARCH_OUTAGES = "search_outages"
+ATTR_QUERY = "query"
+ATTR_PREFIX = "prefix"
+
+# Outage state transitions
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+# Pre-outage alerts, lead times in minutes
+DATA_ALERTS = f"{DOMAIN}_alerts"
+EVENT_UPCOMING_OUTAGE = f"{DOMAIN}_upcoming"
+DEFAULT_ALERT_LEAD_TIMES = [60, 15, 5]
+MAX_ALERT_LEAD_TIME = 24 * 60
+ATTR_BILL_ID = "bill_id"
+ATTR_LEAD_TIME = "lead_time"
+
+# Per-day response cache
+DAY_CACHE_NEAR_DAYS = 2
+DAY_CACHE_NEAR_TTL = timedelta(minutes=15)
+DAY_CACHE_FAR_TTL = timedelta(hours=3)
+
+# Outage history archive
+DATA_ARCHIVE = f"{DOMAIN}_archive"
+ARCHIVE_FILENAME = "planned_blackouts_archive.db"
+ARCHIVE_BATCH_SIZE = 500
+ARCHIVE_FLUSH_DELAY = 30
+HISTORY_WINDOW = timedelta(days=30)
+
+# Diagnostics
+METRICS_WINDOW = 100
+
+# Outage cache
+STORAGE_VERSION = 1
+CACHE_MAX_AGE = timedelta(hours=24)
+CACHE_SAVE_DELAY = 10
+
 # Attributes
 ATTR_OUTAGE_END = "end_time"
 ATTR_OUTAGE_REASON = "reason"
 ATTR_OUTAGE_ADDRESS = "address"
 ATTR_OUTAGE_NUMBER = "outage_number"
+ATTR_FETCHED_AT = "fetched_at"
+ATTR_STALE = "stale"
+ATTR_OUTAGE_START = "start_time"
 
 # Calendar
 CALENDAR_NAME = "Planned Blackouts"
@@ -31,6 +133,17 @@ CALENDAR_NAME = "Planned Blackouts"
 # Sensors
 SENSOR_NEXT_OUTAGE = "next_outage"
 SENSOR_TODAY_COUNT = "today_outages_count"
+SENSOR_DOWNTIME_TODAY = "downtime_today"
+SENSOR_DOWNTIME_WEEK = "downtime_week"
+SENSOR_LONGEST_OUTAGE = "longest_outage"
+SENSOR_HISTORY_COUNT = "history_outages_count"
+SENSOR_HISTORY_MEAN_DURATION = "history_mean_duration"
+
+# Weeks start on Saturday, as in the Iranian calendar
+WEEK_START_WEEKDAY = 5
+
+# Binary sensors
+BINARY_SENSOR_OUTAGE_ACTIVE = "outage_active"
 
 # Update coordinator
 UPDATE_INTERVAL = timedelta(seconds=DEFAULT_POLLING_INTERVAL)
@@ -0,0 +1,394 @@
+"""Data update coordinator for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .address_index import PlannedBlackoutsAddressIndex
+from .alerts import PlannedBlackoutsAlertScheduler
+from .api import PlannedBlackoutsApiClient, PlannedBlackoutsApiError
+from .archive import OutageHistory, PlannedBlackoutsArchive
+from .const import (
+    CONF_ALERT_LEAD_TIMES,
+    CALENDAR_NAME,
+    CONF_BILL_ID,
+    CONF_DAYS_AHEAD,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_INTERVAL,
+    CONF_POLLING_INTERVAL,
+    DEFAULT_ALERT_LEAD_TIMES,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MIN_POLLING_INTERVAL,
+    DOMAIN,
+    HISTORY_WINDOW,
+    UPDATE_INTERVAL,
+    WEEK_START_WEEKDAY,
+)
+from .engine import PlannedBlackoutsFetchEngine
+from .ics import IcsFeed, build_feed
+from .index import OutageIndex
+from .intervals import downtime_between, longest_span, merge_outages, union_spans
+from .metrics import METRIC_DERIVE_DATA, PlannedBlackoutsMetrics
+from .models import Outage, PlannedBlackoutsData
+from .polling import align_to_phase, compute_poll_interval, phase_offset
+from .scheduler import PlannedBlackoutsTransitionScheduler
+from .store import PlannedBlackoutsOutageStore
+
+_LOGGER = logging.getLogger(__name__)
+
+# Parts of the derived data that entities depend on, named after the fields
+# of PlannedBlackoutsData, plus the outage shown as the calendar's state
+DATA_PARTS = (
+    "active_outage",
+    "next_outage",
+    "today_count",
+    "downtime_today",
+    "downtime_week",
+    "longest_outage",
+    "history",
+    "stale",
+)
+PART_CALENDAR_EVENT = "calendar_event"
+
+
+class PlannedBlackoutsDataUpdateCoordinator(DataUpdateCoordinator):
+    """Class to manage fetching Planned Blackouts data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: PlannedBlackoutsApiClient,
+        engine: PlannedBlackoutsFetchEngine,
+        store: PlannedBlackoutsOutageStore,
+        metrics: PlannedBlackoutsMetrics,
+        scheduler: PlannedBlackoutsTransitionScheduler,
+        archive: PlannedBlackoutsArchive,
+        alerts: PlannedBlackoutsAlertScheduler,
+        address_index: PlannedBlackoutsAddressIndex,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.entry = entry
+        self.api = api
+        self.engine = engine
+        self.store = store
+        self.metrics = metrics
+        self.scheduler = scheduler
+        self.archive = archive
+        self.alerts = alerts
+        self.address_index = address_index
+        
+        # Calculate update interval from config
+        update_interval = timedelta(
+            seconds=entry.data.get(CONF_POLLING_INTERVAL, UPDATE_INTERVAL.total_seconds())
+        )
+        self._base_interval = update_interval
+        self._min_interval = timedelta(
+            seconds=entry.data.get(CONF_MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL)
+        )
+        self._max_interval = timedelta(
+            seconds=entry.data.get(CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL)
+        )
+        self._unchanged_polls = 0
+        # Where in each interval this entry polls, so entries do not poll
+        # in step after a restart
+        self._phase = phase_offset(entry.entry_id)
+        # What the entities were last told about
+        self.fingerprints: Dict[str, int] = {}
+        self._published_success: Optional[bool] = None
+        self.changed_parts: FrozenSet[str] = frozenset()
+        # The iCalendar feed and the outages it was serialized from
+        self._ics_feed: Optional[Tuple[List[Outage], IcsFeed]] = None
+        # When the outages last changed
+        self._outages_changed_at: Optional[datetime] = None
+        
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=update_interval,
+        )
+
+    async def async_load_cache(self) -> bool:
+        """Publish cached outages from disk, returning True if any were fresh."""
+        cached = await self.store.async_load()
+        if cached is None:
+            return False
+
+        outages, saved_at = cached
+        data = self._build_data(
+            outages, saved_at, history=await self._async_get_history()
+        )
+        self._async_schedule_transitions(data)
+        self._async_outages_changed(outages, saved_at)
+        self.async_set_updated_data(data)
+        return True
+
+    async def _async_update_data(self) -> PlannedBlackoutsData:
+        """Fetch data from API."""
+        try:
+            # Calculate the date range (today to days_ahead)
+            today = dt_util.now()
+            days_ahead = self.entry.data.get(CONF_DAYS_AHEAD, 7)
+            end_date = today + timedelta(days=days_ahead)
+            
+            # Queue the API request on the shared fetch engine
+            outages = await self.engine.async_fetch(
+                self.entry.entry_id, today, end_date
+            )
+            
+        except ConfigEntryAuthFailed as err:
+            # Handle authentication errors to trigger reauthentication
+            raise ConfigEntryAuthFailed(f"Authentication failed: {err}")
+        except PlannedBlackoutsApiError as err:
+            if self.data is None:
+                raise UpdateFailed(f"Error communicating with API: {err}")
+
+            # Keep serving the last known outages, flagged as stale
+            _LOGGER.warning(
+                "Error communicating with API, keeping data fetched at %s: %s",
+                self.data.fetched_at,
+                err,
+            )
+            data = self._build_data(
+                self.data.outages,
+                self.data.fetched_at,
+                stale=True,
+                history=self.data.history,
+            )
+            self._async_schedule_transitions(data)
+            # Retry at the base interval rather than the backed off one
+            self._unchanged_polls = 0
+            self.update_interval = self._next_poll_interval(data)
+            return data
+        except Exception as err:
+            raise UpdateFailed(f"Error communicating with API: {err}")
+
+        if self.data is not None and outages == self.data.outages:
+            # Keep the old list so whatever was derived from it stays valid
+            outages = self.data.outages
+            self._unchanged_polls += 1
+        else:
+            self._unchanged_polls = 0
+            self._async_outages_changed(outages, dt_util.utcnow())
+            self.archive.async_queue(self.entry.data[CONF_BILL_ID], outages)
+
+        self.store.async_save(outages)
+        history = await self._async_get_history()
+        with self.metrics.timer(METRIC_DERIVE_DATA):
+            data = self._build_data(outages, dt_util.utcnow(), history=history)
+        self._async_schedule_transitions(data)
+        self.update_interval = self._next_poll_interval(data)
+        return data
+
+    async def _async_get_history(self) -> Optional[OutageHistory]:
+        """Read the statistics of recent outages from the archive."""
+        now = dt_util.now()
+        try:
+            return await self.archive.async_get_history(
+                self.entry.data[CONF_BILL_ID], now - HISTORY_WINDOW, now
+            )
+        except sqlite3.Error as err:
+            _LOGGER.warning("Error reading the outage archive: %s", err)
+            return self.data.history if self.data else None
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Work out which parts of the data changed, then update the entities."""
+        fingerprints = self._fingerprint(self.data)
+        if self.last_update_success != self._published_success:
+            # Every entity's availability flips
+            self.changed_parts = frozenset(fingerprints)
+        else:
+            self.changed_parts = frozenset(
+                part
+                for part, fingerprint in fingerprints.items()
+                if self.fingerprints.get(part) != fingerprint
+            )
+        self.fingerprints = fingerprints
+        self._published_success = self.last_update_success
+
+        super().async_update_listeners()
+
+    @staticmethod
+    def _fingerprint(data: Optional[PlannedBlackoutsData]) -> Dict[str, int]:
+        """Return a cheap hash of every part of the derived data."""
+        if data is None:
+            return dict.fromkeys((*DATA_PARTS, PART_CALENDAR_EVENT), 0)
+
+        fingerprints = {part: hash(getattr(data, part)) for part in DATA_PARTS}
+        now = dt_util.now()
+        outage = data.index.current_or_next_outage(now)
+        fingerprints[PART_CALENDAR_EVENT] = hash(
+            (outage, outage is not None and outage.start <= now)
+        )
+        return fingerprints
+
+    @callback
+    def async_detach(self) -> None:
+        """Remove the entry from the shared schedulers and address index."""
+        self.scheduler.async_cancel(self.entry.entry_id)
+        self.alerts.async_cancel(self.entry.entry_id)
+        self.address_index.async_remove(self.entry.entry_id)
+
+    @property
+    def ics_feed(self) -> Optional[IcsFeed]:
+        """Return the outages as a pre-encoded iCalendar feed.
+
+        The feed is serialized on the first request after the outages change
+        and served as is until they change again.
+        """
+        if self.data is None:
+            return None
+
+        outages = self.data.outages
+        if self._ics_feed is None or self._ics_feed[0] is not outages:
+            feed = build_feed(
+                f"{CALENDAR_NAME} {self.entry.data[CONF_BILL_ID]}",
+                merge_outages(outages),
+                self._outages_changed_at or self.data.fetched_at,
+            )
+            self._ics_feed = (outages, feed)
+        return self._ics_feed[1]
+
+    @callback
+    def _async_outages_changed(
+        self, outages: List[Outage], changed_at: datetime
+    ) -> None:
+        """Queue the alerts and index the addresses of changed outages."""
+        self._outages_changed_at = changed_at
+        bill_id = self.entry.data[CONF_BILL_ID]
+        self.alerts.async_update(
+            self.entry.entry_id,
+            bill_id,
+            outages,
+            self.entry.data.get(CONF_ALERT_LEAD_TIMES, DEFAULT_ALERT_LEAD_TIMES),
+        )
+        self.address_index.async_update(self.entry.entry_id, bill_id, outages)
+
+    @callback
+    def _async_schedule_transitions(self, data: PlannedBlackoutsData) -> None:
+        """Arm the scheduler for the next changes of the derived data."""
+        self.scheduler.async_schedule(
+            self.entry.entry_id,
+            self._transition_times(data),
+            self._async_handle_transition,
+        )
+
+    @staticmethod
+    def _transition_times(data: PlannedBlackoutsData) -> Iterator[datetime]:
+        """Yield the instants at which the derived data changes."""
+        now = dt_util.now()
+        # today_count rolls over at local midnight
+        yield dt_util.start_of_local_day(now.date() + timedelta(days=1))
+        for outage in data.outages:
+            if outage.start > now:
+                yield outage.start
+            if outage.end > now:
+                yield outage.end
+
+    @callback
+    def _async_handle_transition(self) -> None:
+        """Recompute the derived data when an outage starts or ends."""
+        if self.data is None:
+            return
+
+        with self.metrics.timer(METRIC_DERIVE_DATA):
+            self.data = self._build_data(
+                self.data.outages,
+                self.data.fetched_at,
+                self.data.stale,
+                history=self.data.history,
+            )
+        self._async_schedule_transitions(self.data)
+        self.async_update_listeners()
+
+    def _next_poll_interval(self, data: PlannedBlackoutsData) -> timedelta:
+        """Adapt the polling interval to how close the next outage is.
+
+        The poll is then moved to this entry's phase of the interval.
+        """
+        now = dt_util.now()
+        outage = data.index.current_or_next_outage(now)
+        in_progress = outage is not None and outage.start <= now
+
+        interval = compute_poll_interval(
+            now,
+            outage.start if outage is not None and not in_progress else None,
+            in_progress,
+            self._unchanged_polls,
+            self._base_interval,
+            self._min_interval,
+            self._max_interval,
+        )
+        return align_to_phase(now, interval, self._phase, self._min_interval)
+
+    def _build_data(
+        self,
+        outages: List[Outage],
+        fetched_at: datetime,
+        stale: bool = False,
+        history: Optional[OutageHistory] = None,
+    ) -> PlannedBlackoutsData:
+        """Derive the coordinator data from processed outages.
+
+        Overlapping and adjacent outages of an address are merged first, so
+        every entity sees each stretch without power once.
+        """
+        merged = merge_outages(outages)
+        spans = union_spans(merged)
+
+        # Process the data for Home Assistant
+        today = dt_util.now()
+        today_date = today.date()
+        today_count = sum(
+            1
+            for outage in merged
+            if dt_util.as_local(outage.start).date() == today_date
+        )
+        day_start = dt_util.start_of_local_day(today_date)
+        days_into_week = (today_date.weekday() - WEEK_START_WEEKDAY) % 7
+        week_start = dt_util.start_of_local_day(
+            today_date - timedelta(days=days_into_week)
+        )
+        
+        # Find the outage in progress and the next upcoming outage
+        active_outage = None
+        next_outage = None
+        for outage in merged:
+            if outage.start > today:
+                if next_outage is None or outage.start < next_outage.start:
+                    next_outage = outage
+            elif outage.end > today:
+                if active_outage is None or outage.end > active_outage.end:
+                    active_outage = outage
+        
+        return PlannedBlackoutsData(
+            outages=outages,
+            active_outage=active_outage,
+            next_outage=next_outage,
+            today_count=today_count,
+            index=OutageIndex(merged),
+            downtime_today=downtime_between(
+                spans,
+                day_start,
+                dt_util.start_of_local_day(today_date + timedelta(days=1)),
+            ),
+            downtime_week=downtime_between(
+                spans,
+                week_start,
+                dt_util.start_of_local_day(week_start.date() + timedelta(days=7)),
+            ),
+            longest_outage=longest_span(spans),
+            history=history,
+            fetched_at=fetched_at,
+            stale=stale,
+        )
@@ -0,0 +1,27 @@
+"""Diagnostics support for Planned Blackouts."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_TOKEN, CONF_BILL_ID, DOMAIN
+
+TO_REDACT = {CONF_API_TOKEN, CONF_BILL_ID}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "last_update_success": coordinator.last_update_success,
+        "outage_count": len(coordinator.data.outages) if coordinator.data else 0,
+        "metrics": coordinator.metrics.as_dict(),
+    }
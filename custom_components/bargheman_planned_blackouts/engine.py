@@ -0,0 +1,302 @@
+"""Shared fetch engine for Planned Blackouts config entries."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .api import PlannedBlackoutsApiClient
+from .coalesce import async_get_coalescer
+from .const import (
+    API_URL,
+    DATA_ENGINE,
+    DEFAULT_PROVIDERS,
+    DOMAIN,
+    MAX_CONCURRENT_FETCHES,
+    OUTAGE_TIME_ZONE,
+    PROVIDER_SAAPA,
+    RANGE_CACHE_SIZE,
+    RANGE_CACHE_TTL,
+    RANGE_CHUNK_DAYS,
+)
+from .metrics import PlannedBlackoutsMetrics
+from .models import Outage, outage_key
+from .providers import (
+    PROVIDERS,
+    PlannedBlackoutsProvider,
+    SaapaProvider,
+    report_url_provider,
+)
+from .ratelimit import async_get_rate_limiter
+
+_LOGGER = logging.getLogger(__name__)
+
+_OUTAGE_TZ = dt_util.get_time_zone(OUTAGE_TIME_ZONE)
+
+_Fetch = Callable[[PlannedBlackoutsApiClient], Awaitable[List[Outage]]]
+_FetchJob = Tuple[str, _Fetch, "asyncio.Future[List[Outage]]"]
+
+
+class PlannedBlackoutsFetchEngine:
+    """Schedule bill fetches for all config entries through one worker pool.
+
+    Every config entry registers its bill with the engine. Coordinators then
+    queue fetches instead of calling the API directly, so the number of
+    concurrent requests to SAAPA stays bounded no matter how many bills are
+    configured.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        max_workers: int = MAX_CONCURRENT_FETCHES,
+        api_url: str = API_URL,
+    ) -> None:
+        """Initialize the fetch engine."""
+        self._hass = hass
+        self._session = async_get_clientsession(hass)
+        self._max_workers = max_workers
+        # Shared by all clients, so each provider has one circuit breaker
+        self._providers: Dict[str, PlannedBlackoutsProvider] = {
+            PROVIDER_SAAPA: SaapaProvider(api_url)
+        }
+        # Outlives the engine so a reload of the last entry can still coalesce
+        self._coalescer = async_get_coalescer(hass)
+        self._rate_limiter = async_get_rate_limiter(hass)
+        self._clients: Dict[str, PlannedBlackoutsApiClient] = {}
+        self._queue: asyncio.Queue[_FetchJob] = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        # (entry_id, first day of chunk) -> (fetched at, outages), least
+        # recently used first
+        self._range_cache: OrderedDict[
+            Tuple[str, date], Tuple[float, List[Outage]]
+        ] = OrderedDict()
+
+    @property
+    def entry_ids(self) -> List[str]:
+        """Return the config entries registered with the engine."""
+        return list(self._clients)
+
+    def async_create_client(
+        self,
+        bill_id: str,
+        token: str,
+        providers: Iterable[str] = DEFAULT_PROVIDERS,
+        report_urls: Iterable[str] = (),
+    ) -> PlannedBlackoutsApiClient:
+        """Return an unregistered API client for a one-off lookup."""
+        return PlannedBlackoutsApiClient(
+            self._session,
+            token,
+            bill_id,
+            providers=self._get_providers(providers, report_urls),
+            coalescer=self._coalescer,
+            rate_limiter=self._rate_limiter,
+        )
+
+    def async_register(
+        self,
+        entry_id: str,
+        bill_id: str,
+        token: str,
+        metrics: Optional[PlannedBlackoutsMetrics] = None,
+        providers: Iterable[str] = DEFAULT_PROVIDERS,
+        report_urls: Iterable[str] = (),
+    ) -> PlannedBlackoutsApiClient:
+        """Register a bill for a config entry and return its API client."""
+        client = PlannedBlackoutsApiClient(
+            self._session,
+            token,
+            bill_id,
+            providers=self._get_providers(providers, report_urls),
+            metrics=metrics,
+            coalescer=self._coalescer,
+            rate_limiter=self._rate_limiter,
+        )
+        self._clients[entry_id] = client
+        return client
+
+    def _get_providers(
+        self, names: Iterable[str], report_urls: Iterable[str] = ()
+    ) -> List[PlannedBlackoutsProvider]:
+        """Return the shared providers with the given names and report URLs."""
+        providers = []
+        for name in names:
+            if (provider := self._providers.get(name)) is None:
+                provider = self._providers[name] = PROVIDERS[name]()
+            providers.append(provider)
+        # Report URLs share the dict with names, which never look like URLs
+        for url in report_urls:
+            if (provider := self._providers.get(url)) is None:
+                provider = self._providers[url] = report_url_provider(url)
+            providers.append(provider)
+        return providers
+
+    def async_unregister(self, entry_id: str) -> bool:
+        """Unregister a config entry, returning True if the engine is now idle."""
+        self._clients.pop(entry_id, None)
+        for key in [key for key in self._range_cache if key[0] == entry_id]:
+            del self._range_cache[key]
+        return not self._clients
+
+    async def async_fetch(
+        self, entry_id: str, from_date: datetime, to_date: datetime
+    ) -> List[Outage]:
+        """Queue a fetch for a registered entry and wait for its outages."""
+        return await self._async_submit(
+            entry_id, lambda client: client.async_get_outages(from_date, to_date)
+        )
+
+    async def async_fetch_range(
+        self, entry_id: str, from_date: datetime, to_date: datetime
+    ) -> List[Outage]:
+        """Fetch an arbitrary range of outages for a registered entry.
+
+        The range is split into chunks of RANGE_CHUNK_DAYS aligned days, so
+        neighbouring calendar views share chunks. Missing chunks are queued
+        on the worker pool together, their outages deduplicated, and kept in
+        a bounded LRU cache.
+        """
+        first_day = from_date.astimezone(_OUTAGE_TZ).date()
+        last_day = to_date.astimezone(_OUTAGE_TZ).date()
+        chunk_starts = []
+        chunk_start = date.fromordinal(
+            first_day.toordinal() - first_day.toordinal() % RANGE_CHUNK_DAYS
+        )
+        while chunk_start <= last_day:
+            chunk_starts.append(chunk_start)
+            chunk_start += timedelta(days=RANGE_CHUNK_DAYS)
+
+        # Fresh chunks are held on to here, other fetches may evict them from
+        # the cache while the missing ones are awaited
+        now = time.monotonic()
+        chunks: Dict[date, List[Outage]] = {}
+        missing = []
+        for chunk_start in chunk_starts:
+            key = (entry_id, chunk_start)
+            cached = self._range_cache.get(key)
+            if cached is None or now - cached[0] >= RANGE_CACHE_TTL.total_seconds():
+                missing.append(chunk_start)
+            else:
+                self._range_cache.move_to_end(key)
+                chunks[chunk_start] = cached[1]
+
+        results = await asyncio.gather(
+            *(
+                self._async_submit(
+                    entry_id,
+                    lambda client, start=chunk_start: client.async_fetch_days(
+                        start, start + timedelta(days=RANGE_CHUNK_DAYS - 1)
+                    ),
+                )
+                for chunk_start in missing
+            ),
+            return_exceptions=True,
+        )
+        fetched_at = time.monotonic()
+        for chunk_start, result in zip(missing, results):
+            if not isinstance(result, BaseException):
+                chunks[chunk_start] = result
+                if entry_id in self._clients:
+                    self._range_cache[(entry_id, chunk_start)] = (fetched_at, result)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        unique: Dict[Hashable, Outage] = {}
+        for chunk_start in chunk_starts:
+            for outage in chunks[chunk_start]:
+                unique.setdefault(outage_key(outage), outage)
+
+        while len(self._range_cache) > RANGE_CACHE_SIZE:
+            self._range_cache.popitem(last=False)
+
+        return [
+            outage
+            for outage in unique.values()
+            if outage.start < to_date and outage.end > from_date
+        ]
+
+    async def _async_submit(self, entry_id: str, fetch: _Fetch) -> List[Outage]:
+        """Queue a fetch on the worker pool and wait for its outages."""
+        if entry_id not in self._clients:
+            raise KeyError(f"Config entry {entry_id} is not registered")
+
+        self._ensure_workers()
+        future: asyncio.Future[List[Outage]] = self._hass.loop.create_future()
+        self._queue.put_nowait((entry_id, fetch, future))
+        return await future
+
+    def _ensure_workers(self) -> None:
+        """Start the worker pool if it is not running yet."""
+        if self._workers:
+            return
+
+        for index in range(self._max_workers):
+            self._workers.append(
+                self._hass.async_create_background_task(
+                    self._worker(), name=f"{DOMAIN} fetch worker {index}"
+                )
+            )
+
+    async def _worker(self) -> None:
+        """Run queued fetches one at a time."""
+        while True:
+            entry_id, fetch, future = await self._queue.get()
+            try:
+                # The waiting coordinator may have been cancelled meanwhile
+                if future.done():
+                    continue
+
+                client = self._clients.get(entry_id)
+                if client is None:
+                    future.set_exception(
+                        KeyError(f"Config entry {entry_id} is not registered")
+                    )
+                    continue
+
+                try:
+                    outages = await fetch(client)
+                except Exception as err:  # pylint: disable=broad-except
+                    if not future.done():
+                        future.set_exception(err)
+                else:
+                    if not future.done():
+                        future.set_result(outages)
+            finally:
+                self._queue.task_done()
+
+    async def async_shutdown(self) -> None:
+        """Stop the worker pool and cancel any queued fetches."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            future.cancel()
+            self._queue.task_done()
+
+
+def async_get_engine(hass: HomeAssistant) -> PlannedBlackoutsFetchEngine:
+    """Return the shared fetch engine, creating it on first use."""
+    if (engine := hass.data.get(DATA_ENGINE)) is None:
+        engine = hass.data[DATA_ENGINE] = PlannedBlackoutsFetchEngine(hass)
+    return engine
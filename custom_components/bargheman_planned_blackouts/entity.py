@@ -0,0 +1,56 @@
+"""Base entity for Planned Blackouts."""
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .metrics import (
+    COUNTER_STATE_WRITES,
+    COUNTER_STATE_WRITES_SKIPPED,
+    METRIC_STATE_WRITE,
+)
+
+
+class PlannedBlackoutsEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when its data changed.
+
+    Subclasses list the parts of the coordinator data their state depends
+    on in _data_parts, or leave it None to write on every update. Their
+    attributes are built by _build_attributes and cached until one of those
+    parts changes.
+    """
+
+    _data_parts: Optional[FrozenSet[str]] = None
+    _attributes_cache: Optional[Tuple[Tuple[Optional[int], ...], Dict[str, Any]]] = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state if it may have changed, and time the write."""
+        metrics = self.coordinator.metrics
+        if self._data_parts is not None and self._data_parts.isdisjoint(
+            self.coordinator.changed_parts
+        ):
+            metrics.increment(COUNTER_STATE_WRITES_SKIPPED)
+            return
+
+        with metrics.timer(METRIC_STATE_WRITE):
+            self.async_write_ha_state()
+        metrics.increment(COUNTER_STATE_WRITES)
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the state attributes, rebuilt only when their data changed."""
+        if self._data_parts is None or not self.coordinator.data:
+            return self._build_attributes()
+
+        fingerprints = self.coordinator.fingerprints
+        key = tuple(fingerprints.get(part) for part in sorted(self._data_parts))
+        if self._attributes_cache is None or self._attributes_cache[0] != key:
+            self._attributes_cache = (key, self._build_attributes())
+        return self._attributes_cache[1]
+
+    def _build_attributes(self) -> Optional[Dict[str, Any]]:
+        """Build the state attributes."""
+        return None
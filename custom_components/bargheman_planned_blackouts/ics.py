@@ -0,0 +1,138 @@
+"""iCalendar serialization of planned outages."""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Iterable, List, NamedTuple
+
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import Outage
+
+_PRODID = "-//Bargheman//Planned Blackouts//EN"
+# Content lines longer than this many octets must be folded (RFC 5545)
+_MAX_LINE_OCTETS = 75
+
+
+class IcsFeed(NamedTuple):
+    """A pre-encoded iCalendar feed and its validators."""
+
+    body: bytes
+    events: bytes
+    etag: str
+    last_modified: datetime
+
+
+def build_feed(name: str, outages: Iterable[Outage], modified: datetime) -> IcsFeed:
+    """Serialize outages into a feed last modified at the given time."""
+    stamp = _format_time(modified)
+    events = b"".join(_encode_event(outage, stamp) for outage in outages)
+    body = _wrap(name, events)
+    return IcsFeed(
+        body=body,
+        events=events,
+        etag=hashlib.sha1(body).hexdigest(),
+        last_modified=dt_util.as_utc(modified).replace(microsecond=0),
+    )
+
+
+def combine_feeds(name: str, feeds: List[IcsFeed]) -> IcsFeed:
+    """Merge the events of several feeds into one feed."""
+    return IcsFeed(
+        body=_wrap(name, b"".join(feed.events for feed in feeds)),
+        events=b"",
+        etag=hashlib.sha1(
+            "".join(feed.etag for feed in feeds).encode()
+        ).hexdigest(),
+        last_modified=max(
+            (feed.last_modified for feed in feeds),
+            default=datetime.fromtimestamp(0, timezone.utc),
+        ),
+    )
+
+
+def _wrap(name: str, events: bytes) -> bytes:
+    """Wrap encoded events in a calendar."""
+    header = _encode_lines(
+        [
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            f"PRODID:{_PRODID}",
+            "CALSCALE:GREGORIAN",
+            "METHOD:PUBLISH",
+            f"X-WR-CALNAME:{_escape(name)}",
+        ]
+    )
+    return header + events + _encode_lines(["END:VCALENDAR"])
+
+
+def _encode_event(outage: Outage, stamp: str) -> bytes:
+    """Encode one outage as a VEVENT."""
+    return _encode_lines(
+        [
+            "BEGIN:VEVENT",
+            f"UID:{_uid(outage)}",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{_format_time(outage.start)}",
+            f"DTEND:{_format_time(outage.end)}",
+            f"SUMMARY:{_escape(f'Power Outage: {outage.address}')}",
+            f"LOCATION:{_escape(outage.address)}",
+            f"DESCRIPTION:{_escape(outage.reason)}",
+            "END:VEVENT",
+        ]
+    )
+
+
+def _uid(outage: Outage) -> str:
+    """Return a UID that stays the same for an outage across refreshes.
+
+    Outages without a number are told apart by a short hash of their
+    address, since several can start at the same time.
+    """
+    identity = outage.outage_number or hashlib.sha1(
+        outage.address.encode()
+    ).hexdigest()[:12]
+    return f"{_escape(identity)}-{int(outage.start.timestamp())}@{DOMAIN}"
+
+
+def _encode_lines(lines: List[str]) -> bytes:
+    """Encode content lines as UTF-8, folded and CRLF terminated."""
+    return b"".join(_fold(line.encode()) + b"\r\n" for line in lines)
+
+
+def _fold(line: bytes) -> bytes:
+    """Fold a content line without splitting a multi-byte character."""
+    if len(line) <= _MAX_LINE_OCTETS:
+        return line
+
+    parts: List[bytes] = []
+    start = 0
+    limit = _MAX_LINE_OCTETS
+    while len(line) - start > limit:
+        end = start + limit
+        # Back off to the first byte of a UTF-8 sequence
+        while line[end] & 0xC0 == 0x80:
+            end -= 1
+        parts.append(line[start:end])
+        start = end
+        # Continuation lines start with a space that counts toward the limit
+        limit = _MAX_LINE_OCTETS - 1
+    parts.append(line[start:])
+    return b"\r\n ".join(parts)
+
+
+def _escape(text: str) -> str:
+    """Escape a TEXT property value."""
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _format_time(moment: datetime) -> str:
+    """Format a moment as an iCalendar UTC date-time."""
+    return dt_util.as_utc(moment).strftime("%Y%m%dT%H%M%SZ")
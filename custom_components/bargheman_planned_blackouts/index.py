@@ -0,0 +1,93 @@
+"""Interval index over planned outages."""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    from homeassistant.components.calendar import CalendarEvent
+
+    from .models import Outage
+
+
+class OutageIndex:
+    """Start-sorted index over outages, built once per refresh.
+
+    Outages are kept sorted by start time. Any outage overlapping an instant
+    must have started no earlier than the longest outage duration before it,
+    so every lookup bisects straight into that window instead of scanning
+    every outage. Calendar events are built on first use, which also keeps
+    the calendar component from being imported with the integration.
+    """
+
+    __slots__ = ("_outages", "_starts", "_ends", "_events", "_max_duration")
+
+    def __init__(self, outages: List[Outage]) -> None:
+        """Build the index from processed outages."""
+        ordered = sorted(outages, key=lambda outage: (outage.start, outage.end))
+        self._outages = ordered
+        self._starts: List[datetime] = [outage.start for outage in ordered]
+        self._ends: List[datetime] = [outage.end for outage in ordered]
+        self._events: Optional[List[CalendarEvent]] = None
+        self._max_duration = max(
+            (end - start for start, end in zip(self._starts, self._ends)),
+            default=timedelta(0),
+        )
+
+    def __len__(self) -> int:
+        """Return the number of indexed outages."""
+        return len(self._outages)
+
+    def current_or_next_outage(self, now: datetime) -> Optional[Outage]:
+        """Return the outage in progress at now, or else the next one."""
+        position = self._current_or_next(now)
+        return self._outages[position] if position is not None else None
+
+    def current_or_next(self, now: datetime) -> Optional[CalendarEvent]:
+        """Return the event of the outage in progress at now, or the next one."""
+        position = self._current_or_next(now)
+        return self._calendar_events()[position] if position is not None else None
+
+    def between(self, start: datetime, end: datetime) -> List[CalendarEvent]:
+        """Return the events of the outages overlapping the start..end range."""
+        hi = bisect_right(self._starts, end)
+        lo = bisect_left(self._starts, start - self._max_duration, 0, hi)
+        events = self._calendar_events()
+
+        return [
+            events[position]
+            for position in range(lo, hi)
+            if self._ends[position] >= start
+        ]
+
+    def _current_or_next(self, now: datetime) -> Optional[int]:
+        """Return the position of the outage in progress at now, or the next."""
+        hi = bisect_right(self._starts, now)
+        lo = bisect_left(self._starts, now - self._max_duration, 0, hi)
+
+        for position in range(lo, hi):
+            if self._ends[position] >= now:
+                return position
+
+        if hi < len(self._outages):
+            return hi
+
+        return None
+
+    def _calendar_events(self) -> List[CalendarEvent]:
+        """Return the calendar events of the outages, building them once."""
+        if self._events is None:
+            # pylint: disable-next=import-outside-toplevel
+            from homeassistant.components.calendar import CalendarEvent
+
+            self._events = [
+                CalendarEvent(
+                    start=outage.start,
+                    end=outage.end,
+                    summary=f"Power Outage: {outage.address}",
+                    description=outage.reason,
+                )
+                for outage in self._outages
+            ]
+        return self._events
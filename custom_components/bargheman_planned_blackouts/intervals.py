@@ -0,0 +1,73 @@
+"""Interval arithmetic over planned outages."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+
+from .models import Outage, Span, intern_text
+
+
+def merge_outages(outages: Iterable[Outage]) -> List[Outage]:
+    """Merge overlapping or adjacent outages of the same address.
+
+    Outages are sorted by address and start once and swept in a single pass.
+    A merged outage keeps the reasons and outage numbers of its parts.
+    """
+    merged: List[Outage] = []
+    ordered = sorted(outages, key=lambda item: (item.address, item.start, item.end))
+    for outage in ordered:
+        if merged:
+            last = merged[-1]
+            if last.address == outage.address and outage.start <= last.end:
+                merged[-1] = _combine(last, outage)
+                continue
+        merged.append(outage)
+
+    merged.sort(key=lambda item: (item.start, item.end))
+    return merged
+
+
+def _combine(first: Outage, second: Outage) -> Outage:
+    """Return one outage covering two overlapping outages of an address."""
+    reason = first.reason
+    if second.reason not in reason.split(" / "):
+        reason = intern_text(f"{reason} / {second.reason}")
+    outage_number = first.outage_number
+    if second.outage_number not in outage_number.split(", "):
+        outage_number = f"{outage_number}, {second.outage_number}"
+
+    return first._replace(
+        end=max(first.end, second.end),
+        reason=reason,
+        outage_number=outage_number,
+    )
+
+
+def union_spans(outages: Iterable[Outage]) -> List[Span]:
+    """Return the start-sorted union of the outages, across all addresses."""
+    spans: List[Span] = []
+    for outage in sorted(outages, key=lambda item: item.start):
+        if spans and outage.start <= spans[-1].end:
+            if outage.end > spans[-1].end:
+                spans[-1] = spans[-1]._replace(end=outage.end)
+            continue
+        spans.append(Span(outage.start, outage.end))
+
+    return spans
+
+
+def downtime_between(spans: List[Span], start: datetime, end: datetime) -> timedelta:
+    """Return how much of start..end is covered by sorted, disjoint spans."""
+    total = timedelta(0)
+    for span in spans:
+        if span.start >= end:
+            break
+        if span.end > start:
+            total += min(span.end, end) - max(span.start, start)
+
+    return total
+
+
+def longest_span(spans: List[Span]) -> Optional[Span]:
+    """Return the longest continuous span, if any."""
+    return max(spans, key=lambda span: span.duration, default=None)
@@ -0,0 +1,129 @@
+"""Fast Jalali (Shamsi) date and time conversions.
+
+The API reports every outage as a Shamsi date string plus ``HH:MM`` times,
+and a response repeats the same handful of dates over and over. Instead of
+running ``jdatetime.datetime.strptime`` for every time, dates in the active
+window are looked up in a precomputed day table, other dates go through a
+bounded memo, and times are parsed by hand.
+
+jdatetime itself is only imported on first use; call ``load`` from the
+executor to keep that import off the event loop.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, tzinfo
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Optional, Tuple
+
+# Days kept in the table on either side of the requested window
+_WINDOW_MARGIN = timedelta(days=7)
+_MEMO_SIZE = 512
+
+_gregorian_by_shamsi: Dict[str, date] = {}
+_shamsi_by_gregorian: Dict[date, str] = {}
+_window: Optional[Tuple[date, date]] = None
+_jdatetime: Optional[ModuleType] = None
+
+
+def load() -> ModuleType:
+    """Import jdatetime, which is slow to import, and return it."""
+    global _jdatetime  # pylint: disable=global-statement
+
+    if _jdatetime is None:
+        import jdatetime  # pylint: disable=import-outside-toplevel
+
+        _jdatetime = jdatetime
+    return _jdatetime
+
+
+def prepare_window(first_day: date, last_day: date) -> None:
+    """Make sure the day table covers first_day..last_day."""
+    global _window  # pylint: disable=global-statement
+
+    if _window is not None and _window[0] <= first_day and last_day <= _window[1]:
+        return
+
+    start = first_day - _WINDOW_MARGIN
+    end = last_day + _WINDOW_MARGIN
+    gregorian_by_shamsi: Dict[str, date] = {}
+    shamsi_by_gregorian: Dict[date, str] = {}
+
+    shamsi_day = load().date.fromgregorian(date=start)
+    day = start
+    while day <= end:
+        shamsi = f"{shamsi_day.year:04d}/{shamsi_day.month:02d}/{shamsi_day.day:02d}"
+        gregorian_by_shamsi[shamsi] = day
+        shamsi_by_gregorian[day] = shamsi
+        shamsi_day += timedelta(days=1)
+        day += timedelta(days=1)
+
+    _gregorian_by_shamsi.clear()
+    _gregorian_by_shamsi.update(gregorian_by_shamsi)
+    _shamsi_by_gregorian.clear()
+    _shamsi_by_gregorian.update(shamsi_by_gregorian)
+    _window = (start, end)
+
+
+def to_shamsi(day: date) -> str:
+    """Convert a Gregorian date to a YYYY/MM/DD Shamsi string."""
+    if (shamsi := _shamsi_by_gregorian.get(day)) is not None:
+        return shamsi
+    return _to_shamsi(day)
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _to_shamsi(day: date) -> str:
+    """Convert a Gregorian date through jdatetime."""
+    return load().date.fromgregorian(date=day).strftime("%Y/%m/%d")
+
+
+def from_shamsi(
+    date_str: str, time_str: str, time_zone: Optional[tzinfo] = None
+) -> datetime:
+    """Convert a Shamsi date and HH:MM time to a Gregorian datetime.
+
+    Raises ValueError for input that ``strptime`` with ``%Y/%m/%d %H:%M``
+    would reject.
+    """
+    day = _gregorian_by_shamsi.get(date_str)
+    if day is None:
+        day = _parse_shamsi_date(date_str)
+    hour, minute = parse_time(time_str)
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=time_zone)
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def _parse_shamsi_date(date_str: str) -> date:
+    """Parse a YYYY/MM/DD Shamsi date string to a Gregorian date."""
+    parts = date_str.split("/")
+    if (
+        len(parts) != 3
+        or not _is_number(parts[0], 4, 4)
+        or not _is_number(parts[1], 1, 2)
+        or not _is_number(parts[2], 1, 2)
+    ):
+        raise ValueError(f"time data '{date_str}' does not match format '%Y/%m/%d'")
+
+    return load().date(int(parts[0]), int(parts[1]), int(parts[2])).togregorian()
+
+
+def parse_time(time_str: str) -> Tuple[int, int]:
+    """Parse an HH:MM time string into hour and minute."""
+    hour, separator, minute = time_str.partition(":")
+    if not separator or not _is_number(hour, 1, 2) or not _is_number(minute, 1, 2):
+        raise ValueError(f"time data '{time_str}' does not match format '%H:%M'")
+
+    hour_value = int(hour)
+    minute_value = int(minute)
+    if hour_value > 23:
+        raise ValueError("hour must be in 0..23")
+    if minute_value > 59:
+        raise ValueError("minute must be in 0..59")
+
+    return hour_value, minute_value
+
+
+def _is_number(value: str, min_digits: int, max_digits: int) -> bool:
+    """Return True if value is min_digits to max_digits decimal digits."""
+    return min_digits <= len(value) <= max_digits and value.isdecimal()
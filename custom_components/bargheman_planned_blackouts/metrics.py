@@ -0,0 +1,105 @@
+"""Hot-path timings and counters for Planned Blackouts."""
+from __future__ import annotations
+
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from .const import METRICS_WINDOW
+
+# Histograms
+METRIC_FETCH_LATENCY = "fetch_latency"
+METRIC_JSON_DECODE = "json_decode"
+METRIC_PROCESS_RESPONSE = "process_response"
+METRIC_PARSE_PER_OUTAGE = "parse_time_per_outage"
+METRIC_PAYLOAD_BYTES = "payload_bytes"
+METRIC_DERIVE_DATA = "derive_data"
+METRIC_STATE_WRITE = "state_write"
+
+# Counters
+COUNTER_REQUESTS = "requests"
+COUNTER_REQUEST_ERRORS = "request_errors"
+COUNTER_REQUESTS_COALESCED = "requests_coalesced"
+COUNTER_OUTAGES_PROCESSED = "outages_processed"
+COUNTER_STATE_WRITES = "state_writes"
+COUNTER_STATE_WRITES_SKIPPED = "state_writes_skipped"
+
+
+class RollingHistogram:
+    """Keep the most recent samples of a measurement."""
+
+    __slots__ = ("_samples",)
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize the histogram."""
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    @property
+    def last(self) -> Optional[float]:
+        """Return the most recent sample."""
+        return self._samples[-1] if self._samples else None
+
+    def add(self, value: float) -> None:
+        """Record a sample."""
+        self._samples.append(value)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, last, mean and percentiles of the samples."""
+        if not self._samples:
+            return {"count": 0}
+
+        ordered = sorted(self._samples)
+        count = len(ordered)
+        return {
+            "count": count,
+            "last": self._samples[-1],
+            "min": ordered[0],
+            "mean": sum(ordered) / count,
+            "p50": ordered[(count - 1) // 2],
+            "p95": ordered[min(count - 1, round(0.95 * (count - 1)))],
+            "max": ordered[-1],
+        }
+
+
+class PlannedBlackoutsMetrics:
+    """Rolling histograms and counters for one config entry."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._histograms: Dict[str, RollingHistogram] = {}
+        self._counters: Dict[str, int] = {}
+
+    def record(self, name: str, value: float) -> None:
+        """Add a sample to a histogram."""
+        if (histogram := self._histograms.get(name)) is None:
+            histogram = self._histograms[name] = RollingHistogram()
+        histogram.add(value)
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        """Increase a counter."""
+        self._counters[name] = self._counters.get(name, 0) + amount
+
+    def last(self, name: str) -> Optional[float]:
+        """Return the most recent sample of a histogram."""
+        histogram = self._histograms.get(name)
+        return histogram.last if histogram is not None else None
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Record how long the wrapped block takes, in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return all histograms and counters for diagnostics."""
+        return {
+            "histograms": {
+                name: histogram.summary()
+                for name, histogram in sorted(self._histograms.items())
+            },
+            "counters": dict(sorted(self._counters.items())),
+        }
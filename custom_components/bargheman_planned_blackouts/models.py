@@ -0,0 +1,70 @@
+"""Data models for Planned Blackouts."""
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Hashable, List, NamedTuple, Optional
+
+from .index import OutageIndex
+
+if TYPE_CHECKING:
+    from .archive import OutageHistory
+
+
+class Outage(NamedTuple):
+    """A processed planned outage."""
+
+    start: datetime
+    end: datetime
+    reason: str
+    address: str
+    outage_number: str
+
+
+class Span(NamedTuple):
+    """A continuous stretch of time without power."""
+
+    start: datetime
+    end: datetime
+
+    @property
+    def duration(self) -> timedelta:
+        """Return the length of the span."""
+        return self.end - self.start
+
+
+def outage_key(outage: Outage) -> Hashable:
+    """Return what identifies an outage when the same one is fetched twice.
+
+    Outages are told apart by their number and start. The API leaves the
+    number out for some outages, so those are compared by every field.
+    """
+    if outage.outage_number:
+        return (outage.outage_number, outage.start)
+    return outage
+
+
+def intern_text(value: str) -> str:
+    """Return the shared copy of a string repeated across outages and bills."""
+    return sys.intern(value)
+
+
+@dataclass(frozen=True, slots=True)
+class PlannedBlackoutsData:
+    """Data derived by the coordinator from the processed outages."""
+
+    outages: List[Outage]
+    active_outage: Optional[Outage]
+    next_outage: Optional[Outage]
+    today_count: int
+    index: OutageIndex
+    # Downtime of the merged outages, across all addresses
+    downtime_today: timedelta
+    downtime_week: timedelta
+    longest_outage: Optional[Span]
+    # Statistics over the archived outages of the last HISTORY_WINDOW
+    history: Optional[OutageHistory]
+    # When the outages were fetched, and whether refreshing them since failed
+    fetched_at: datetime
+    stale: bool = False
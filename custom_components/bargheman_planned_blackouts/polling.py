@@ -0,0 +1,59 @@
+"""Adaptive polling interval for Planned Blackouts."""
+from __future__ import annotations
+
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from .const import MAX_BACKOFF_EXPONENT, PROXIMITY_FACTOR
+
+
+def compute_poll_interval(
+    now: datetime,
+    next_start: Optional[datetime],
+    in_progress: bool,
+    unchanged_polls: int,
+    base: timedelta,
+    minimum: timedelta,
+    maximum: timedelta,
+) -> timedelta:
+    """Return how long to wait before the next poll.
+
+    While an outage is in progress the minimum interval is used. Otherwise
+    the interval doubles for every poll in a row that returned unchanged
+    data, starting from the base interval, but never exceeds a fraction of
+    the time left until the next known outage.
+    """
+    if in_progress:
+        return minimum
+
+    exponent = min(unchanged_polls, MAX_BACKOFF_EXPONENT)
+    interval = min(base * 2**exponent, maximum)
+
+    if next_start is not None:
+        interval = min(interval, (next_start - now) * PROXIMITY_FACTOR)
+
+    return max(minimum, min(interval, maximum))
+
+
+def phase_offset(key: str) -> float:
+    """Return a stable fraction in [0, 1) that spreads keys evenly."""
+    return zlib.crc32(key.encode()) / 2**32
+
+
+def align_to_phase(
+    now: datetime, interval: timedelta, phase: float, minimum: timedelta
+) -> timedelta:
+    """Shorten an interval so the poll lands at the given phase of it.
+
+    Polls are placed on a wall-clock grid of the interval, shifted by phase
+    times the interval, so entries polling at the same interval stay spread
+    across it rather than polling in step. The delay never exceeds the
+    interval, so the bounds and the outage-proximity cap still hold. A grid
+    point closer than the minimum interval is skipped in favour of waiting
+    the minimum, and the poll after it lands back on the grid.
+    """
+    period = interval.total_seconds()
+    delay = period - (now.timestamp() - phase * period) % period
+
+    return timedelta(seconds=min(max(delay, minimum.total_seconds()), period))
@@ -0,0 +1,141 @@
+"""Outage report providers for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Any, Dict, Optional, Tuple, Type
+from urllib.parse import urlparse
+
+from homeassistant.util import dt as dt_util
+
+from . import jalali
+from .const import API_URL, OUTAGE_TIME_ZONE, PROVIDER_SAAPA, PROVIDER_TIMEOUT
+from .models import Outage, intern_text
+from .resilience import CircuitBreaker
+
+_LOGGER = logging.getLogger(__name__)
+
+_OUTAGE_TZ = dt_util.get_time_zone(OUTAGE_TIME_ZONE)
+
+
+class PlannedBlackoutsProvider(ABC):
+    """A report endpoint and the format of its requests and responses.
+
+    Subclasses build the request for a bill and a range of days and turn
+    the items of the response into outages. Sending, retries, streaming and
+    caching are the same for every provider and live in the API client.
+    One instance is shared by all clients, along with its circuit breaker.
+    """
+
+    name: str
+    # Key of the array of outage items in the response
+    items_key = "data"
+
+    def __init__(
+        self, url: str, timeout: float = PROVIDER_TIMEOUT, name: Optional[str] = None
+    ) -> None:
+        """Initialize the provider, optionally under a name of its own."""
+        if name is not None:
+            self.name = name
+        self.url = url
+        # Deadline for a range, retries included
+        self.timeout = timeout
+        self.circuit_breaker = CircuitBreaker(self.name)
+
+    def prepare_window(self, first_day: date, last_day: date) -> None:
+        """Get ready for the requests of a polling window."""
+
+    @abstractmethod
+    def build_request(
+        self, bill_id: str, token: str, first_day: date, last_day: date
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Return the JSON payload and headers requesting a range of days."""
+
+    @abstractmethod
+    def parse_item(self, item: Any) -> Optional[Outage]:
+        """Turn one item of the response into an outage, or None if malformed."""
+
+
+class SaapaProvider(PlannedBlackoutsProvider):
+    """The SAAPA planned blackouts report, with Shamsi dates."""
+
+    name = PROVIDER_SAAPA
+
+    def __init__(
+        self,
+        url: str = API_URL,
+        timeout: float = PROVIDER_TIMEOUT,
+        name: Optional[str] = None,
+    ) -> None:
+        """Initialize the provider."""
+        super().__init__(url, timeout, name)
+
+    def prepare_window(self, first_day: date, last_day: date) -> None:
+        """Precompute the Shamsi dates of the window."""
+        jalali.prepare_window(first_day, last_day)
+
+    def build_request(
+        self, bill_id: str, token: str, first_day: date, last_day: date
+    ) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        """Return the JSON payload and headers requesting a range of days."""
+        payload = {
+            "bill_id": bill_id,
+            "from_date": jalali.to_shamsi(first_day),
+            "to_date": jalali.to_shamsi(last_day),
+        }
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token}",
+        }
+        return payload, headers
+
+    def parse_item(self, item: Any) -> Optional[Outage]:
+        """Turn one item of the response into an outage, or None if malformed."""
+        if not isinstance(item, dict):
+            _LOGGER.warning("Skipping malformed outage: %s", item)
+            return None
+
+        # Extract all required fields
+        outage_date = item.get("outage_date")
+        start_time = item.get("outage_start_time")
+        end_time = item.get("outage_stop_time")
+        reason = item.get("reason_outage")
+        address = item.get("address")
+        outage_number = item.get("outage_number")
+
+        # Skip if any required field is missing
+        if not all([outage_date, start_time, end_time]):
+            _LOGGER.warning("Skipping outage with missing required fields: %s", item)
+            return None
+
+        try:
+            # Convert date and times to Gregorian
+            start_datetime = jalali.from_shamsi(outage_date, start_time, _OUTAGE_TZ)
+            end_datetime = jalali.from_shamsi(outage_date, end_time, _OUTAGE_TZ)
+
+            return Outage(
+                start=start_datetime,
+                end=end_datetime,
+                reason=intern_text(reason or "Unknown reason"),
+                address=intern_text(address or "Unknown location"),
+                outage_number=outage_number or "",
+            )
+        except (ValueError, TypeError) as err:
+            _LOGGER.error("Error processing outage data: %s - %s", err, item)
+            return None
+
+
+# Providers an entry can be configured with, by name
+PROVIDERS: Dict[str, Type[PlannedBlackoutsProvider]] = {
+    PROVIDER_SAAPA: SaapaProvider,
+}
+
+
+def report_url_provider(url: str) -> PlannedBlackoutsProvider:
+    """Return a provider for another endpoint serving the SAAPA report format.
+
+    Distribution companies run their own copies of the report, so these are
+    named after their host for logs and their circuit breaker.
+    """
+    return SaapaProvider(url, name=urlparse(url).netloc or url)
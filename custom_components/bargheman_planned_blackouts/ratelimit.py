@@ -0,0 +1,50 @@
+"""Rate limiting for SAAPA API requests."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import API_RATE_BURST, API_RATE_LIMIT, DATA_RATE_LIMITER
+
+
+class TokenBucket:
+    """Let requests through at a steady rate, allowing short bursts.
+
+    The bucket holds up to capacity tokens and refills at rate tokens per
+    second. Waiters are served one at a time, in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        """Initialize a full bucket."""
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated_at) * self._rate
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+@callback
+def async_get_rate_limiter(hass: HomeAssistant) -> TokenBucket:
+    """Return the limiter shared by all API requests, creating it on first use."""
+    if (limiter := hass.data.get(DATA_RATE_LIMITER)) is None:
+        limiter = hass.data[DATA_RATE_LIMITER] = TokenBucket(
+            API_RATE_LIMIT, API_RATE_BURST
+        )
+    return limiter
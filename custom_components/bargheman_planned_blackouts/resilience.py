@@ -0,0 +1,89 @@
+"""Retry and circuit breaker helpers for the SAAPA API."""
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+class CircuitBreaker:
+    """Stop calling an endpoint after repeated failures.
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failures the circuit opens and
+    requests are refused until CIRCUIT_RESET_TIMEOUT has passed. A single
+    trial request is then let through: success closes the circuit again,
+    failure re-opens it for another timeout.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT.total_seconds(),
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_started_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests are being refused."""
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent now."""
+        if self._opened_at is None:
+            return True
+
+        now = time.monotonic()
+        # A trial that never reported back counts as lost after a timeout
+        if (
+            self._trial_started_at is not None
+            and now - self._trial_started_at < self._reset_timeout
+        ):
+            return False
+        if now - self._opened_at < self._reset_timeout:
+            return False
+
+        self._trial_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self._opened_at is not None:
+            _LOGGER.info("API %s recovered, closing circuit", self._name)
+        self._failures = 0
+        self._opened_at = None
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit if needed."""
+        self._failures += 1
+        self._trial_started_at = None
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            if self._opened_at is None:
+                _LOGGER.warning(
+                    "API %s failed %s times in a row, pausing requests for %s seconds",
+                    self._name,
+                    self._failures,
+                    self._reset_timeout,
+                )
+            self._opened_at = time.monotonic()
@@ -0,0 +1,90 @@
+"""Timer-driven outage state transitions for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_SCHEDULER
+from .timers import TimerHeap
+
+_LOGGER = logging.getLogger(__name__)
+
+# (when, generation, entry_id)
+_Boundary = Tuple[datetime, int, str]
+
+
+class PlannedBlackoutsTransitionScheduler:
+    """Run the state transitions of all config entries from a single timer.
+
+    Every refresh hands the scheduler the instants at which an entry's
+    derived state changes: outage starts and ends, and local midnight. They
+    are kept in one TimerHeap. Boundaries of an entry are replaced by
+    bumping its generation, so stale heap items are simply skipped when
+    they surface.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self._timers: TimerHeap[_Boundary] = TimerHeap(
+            hass, self._is_live, self._async_run_due
+        )
+        self._generations: Dict[str, int] = {}
+        self._actions: Dict[str, Callable[[], None]] = {}
+        self._live: Dict[str, int] = {}
+
+    @callback
+    def async_schedule(
+        self,
+        entry_id: str,
+        boundaries: Iterable[datetime],
+        action: Callable[[], None],
+    ) -> None:
+        """Replace the upcoming boundaries of an entry."""
+        generation = self._generations.get(entry_id, 0) + 1
+        self._generations[entry_id] = generation
+        self._actions[entry_id] = action
+
+        count = 0
+        for when in boundaries:
+            self._timers.push((dt_util.as_utc(when), generation, entry_id))
+            count += 1
+        self._live[entry_id] = count
+
+        self._timers.async_rearm(sum(self._live.values()))
+
+    @callback
+    def async_cancel(self, entry_id: str) -> None:
+        """Forget the boundaries of an unloaded entry."""
+        self._generations.pop(entry_id, None)
+        self._actions.pop(entry_id, None)
+        self._live.pop(entry_id, None)
+        self._timers.async_rearm(sum(self._live.values()))
+
+    def _is_live(self, boundary: _Boundary) -> bool:
+        """Return True if a heap item belongs to the entry's latest boundaries."""
+        return self._generations.get(boundary[2]) == boundary[1]
+
+    @callback
+    def _async_run_due(self, boundaries: List[_Boundary]) -> None:
+        """Run the actions of every entry with a boundary that has passed."""
+        due: Dict[str, None] = {}
+        for _, _, entry_id in boundaries:
+            self._live[entry_id] -= 1
+            due[entry_id] = None
+
+        for entry_id in due:
+            _LOGGER.debug("Outage state transition for %s", entry_id)
+            self._actions[entry_id]()
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> PlannedBlackoutsTransitionScheduler:
+    """Return the shared transition scheduler, creating it on first use."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = PlannedBlackoutsTransitionScheduler(hass)
+        hass.data[DATA_SCHEDULER] = scheduler
+    return scheduler
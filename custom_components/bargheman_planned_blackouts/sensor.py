@@ -5,22 +5,41 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import (
+    ATTR_FETCHED_AT,
     ATTR_OUTAGE_ADDRESS,
     ATTR_OUTAGE_END,
     ATTR_OUTAGE_NUMBER,
     ATTR_OUTAGE_REASON,
+    ATTR_OUTAGE_START,
+    ATTR_STALE,
     DOMAIN,
+    SENSOR_DOWNTIME_TODAY,
+    SENSOR_DOWNTIME_WEEK,
+    SENSOR_HISTORY_COUNT,
+    SENSOR_HISTORY_MEAN_DURATION,
+    SENSOR_LONGEST_OUTAGE,
     SENSOR_NEXT_OUTAGE,
     SENSOR_TODAY_COUNT,
 )
-from . import PlannedBlackoutsDataUpdateCoordinator
+from .coordinator import PlannedBlackoutsDataUpdateCoordinator
+from .entity import PlannedBlackoutsEntity
+from .metrics import (
+    METRIC_FETCH_LATENCY,
+    METRIC_PARSE_PER_OUTAGE,
+    METRIC_PAYLOAD_BYTES,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -35,6 +54,92 @@ SENSOR_DESCRIPTIONS = [
         name="Today's Planned Outages",
         icon="mdi:calendar-today",
     ),
+    SensorEntityDescription(
+        key=SENSOR_DOWNTIME_TODAY,
+        name="Planned Downtime Today",
+        icon="mdi:timer-off-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    SensorEntityDescription(
+        key=SENSOR_DOWNTIME_WEEK,
+        name="Planned Downtime This Week",
+        icon="mdi:calendar-week",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    SensorEntityDescription(
+        key=SENSOR_LONGEST_OUTAGE,
+        name="Longest Planned Outage",
+        icon="mdi:timer-alert-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+    SensorEntityDescription(
+        key=SENSOR_HISTORY_COUNT,
+        name="Planned Outages Last 30 Days",
+        icon="mdi:history",
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    SensorEntityDescription(
+        key=SENSOR_HISTORY_MEAN_DURATION,
+        name="Mean Planned Outage Duration",
+        icon="mdi:chart-timeline-variant",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+    ),
+]
+
+# Parts of the coordinator data each sensor's state depends on
+SENSOR_DATA_PARTS = {
+    SENSOR_NEXT_OUTAGE: frozenset({"next_outage", "stale"}),
+    SENSOR_TODAY_COUNT: frozenset({"today_count", "stale"}),
+    SENSOR_DOWNTIME_TODAY: frozenset({"downtime_today", "stale"}),
+    SENSOR_DOWNTIME_WEEK: frozenset({"downtime_week", "stale"}),
+    SENSOR_LONGEST_OUTAGE: frozenset({"longest_outage", "stale"}),
+    SENSOR_HISTORY_COUNT: frozenset({"history", "stale"}),
+    SENSOR_HISTORY_MEAN_DURATION: frozenset({"history", "stale"}),
+}
+
+# Diagnostic sensors reporting the latest sample of a metric, with the
+# factor converting the recorded value to the sensor's unit
+DIAGNOSTIC_SENSOR_DESCRIPTIONS = [
+    (
+        SensorEntityDescription(
+            key=METRIC_FETCH_LATENCY,
+            name="Last Fetch Latency",
+            icon="mdi:timer-outline",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        1000,
+    ),
+    (
+        SensorEntityDescription(
+            key=METRIC_PAYLOAD_BYTES,
+            name="Last Payload Size",
+            icon="mdi:download-network-outline",
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        1,
+    ),
+    (
+        SensorEntityDescription(
+            key=METRIC_PARSE_PER_OUTAGE,
+            name="Parse Time per Outage",
+            icon="mdi:timer-cog-outline",
+            native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+            state_class=SensorStateClass.MEASUREMENT,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            entity_registry_enabled_default=False,
+        ),
+        1_000_000,
+    ),
 ]
 
 
@@ -49,11 +154,15 @@ async def async_setup_entry(
     entities = []
     for description in SENSOR_DESCRIPTIONS:
         entities.append(PlannedBlackoutsSensor(coordinator, description))
+    for description, scale in DIAGNOSTIC_SENSOR_DESCRIPTIONS:
+        entities.append(
+            PlannedBlackoutsDiagnosticSensor(coordinator, description, scale)
+        )
     
     async_add_entities(entities, True)
 
 
-class PlannedBlackoutsSensor(CoordinatorEntity, SensorEntity):
+class PlannedBlackoutsSensor(PlannedBlackoutsEntity, SensorEntity):
     """Representation of a Planned Blackouts sensor."""
 
     def __init__(
@@ -66,6 +175,7 @@ class PlannedBlackoutsSensor(CoordinatorEntity, SensorEntity):
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
         self._attr_name = description.name
+        self._data_parts = SENSOR_DATA_PARTS[description.key]
         
     @property
     def native_value(self) -> Any:
@@ -75,32 +185,100 @@ class PlannedBlackoutsSensor(CoordinatorEntity, SensorEntity):
             
         if self.entity_description.key == SENSOR_NEXT_OUTAGE:
             # Return the start time of the next outage
-            next_outage = self.coordinator.data.get("next_outage")
+            next_outage = self.coordinator.data.next_outage
             if next_outage:
-                return next_outage["start"].isoformat()
+                return next_outage.start.isoformat()
             return None
             
         elif self.entity_description.key == SENSOR_TODAY_COUNT:
             # Return the count of today's outages
-            return self.coordinator.data.get("today_count", 0)
+            return self.coordinator.data.today_count
+
+        elif self.entity_description.key == SENSOR_DOWNTIME_TODAY:
+            return round(self.coordinator.data.downtime_today.total_seconds() / 60)
+
+        elif self.entity_description.key == SENSOR_DOWNTIME_WEEK:
+            return round(self.coordinator.data.downtime_week.total_seconds() / 60)
+
+        elif self.entity_description.key == SENSOR_LONGEST_OUTAGE:
+            longest_outage = self.coordinator.data.longest_outage
+            if longest_outage:
+                return round(longest_outage.duration.total_seconds() / 60)
+            return None
+
+        elif self.entity_description.key == SENSOR_HISTORY_COUNT:
+            history = self.coordinator.data.history
+            if history:
+                return history.count
+            return None
+
+        elif self.entity_description.key == SENSOR_HISTORY_MEAN_DURATION:
+            history = self.coordinator.data.history
+            if history and history.mean_duration is not None:
+                return round(history.mean_duration.total_seconds() / 60)
+            return None
             
         return None
         
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return the state attributes."""
+    def _build_attributes(self) -> Dict[str, Any]:
+        """Build the state attributes."""
         attrs = {}
-        
+        if not self.coordinator.data:
+            return attrs
+
+        # Tell automations whether the outages could be refreshed recently
+        attrs[ATTR_STALE] = self.coordinator.data.stale
+        # The fetch time only changes while the data is fresh, so it is shown
+        # while stale to tell how old the data is without a write every poll
+        if (
+            self.entity_description.key == SENSOR_NEXT_OUTAGE
+            and self.coordinator.data.stale
+        ):
+            attrs[ATTR_FETCHED_AT] = self.coordinator.data.fetched_at.isoformat()
+
         # Only add attributes for the next outage sensor
         if (
             self.entity_description.key == SENSOR_NEXT_OUTAGE
-            and self.coordinator.data
-            and self.coordinator.data.get("next_outage")
+            and self.coordinator.data.next_outage
+        ):
+            next_outage = self.coordinator.data.next_outage
+            attrs[ATTR_OUTAGE_END] = next_outage.end.isoformat()
+            attrs[ATTR_OUTAGE_REASON] = next_outage.reason
+            attrs[ATTR_OUTAGE_ADDRESS] = next_outage.address
+            attrs[ATTR_OUTAGE_NUMBER] = next_outage.outage_number
+
+        # Tell when the longest outage happens
+        if (
+            self.entity_description.key == SENSOR_LONGEST_OUTAGE
+            and self.coordinator.data.longest_outage
         ):
-            next_outage = self.coordinator.data["next_outage"]
-            attrs[ATTR_OUTAGE_END] = next_outage["end"].isoformat()
-            attrs[ATTR_OUTAGE_REASON] = next_outage["reason"]
-            attrs[ATTR_OUTAGE_ADDRESS] = next_outage["address"]
-            attrs[ATTR_OUTAGE_NUMBER] = next_outage["outage_number"]
+            longest_outage = self.coordinator.data.longest_outage
+            attrs[ATTR_OUTAGE_START] = longest_outage.start.isoformat()
+            attrs[ATTR_OUTAGE_END] = longest_outage.end.isoformat()
             
         return attrs
+
+
+class PlannedBlackoutsDiagnosticSensor(PlannedBlackoutsEntity, SensorEntity):
+    """Diagnostic sensor reporting the latest sample of a hot-path metric."""
+
+    def __init__(
+        self,
+        coordinator: PlannedBlackoutsDataUpdateCoordinator,
+        description: SensorEntityDescription,
+        scale: float,
+    ) -> None:
+        """Initialize the diagnostic sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        self._attr_name = description.name
+        self._scale = scale
+
+    @property
+    def native_value(self) -> Optional[float]:
+        """Return the latest sample in the sensor's unit."""
+        value = self.coordinator.metrics.last(self.entity_description.key)
+        if value is None:
+            return None
+        return round(value * self._scale, 2)
@@ -0,0 +1,245 @@
+"""Services for the Planned Blackouts integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from . import jalali
+from .address_index import async_get_address_index
+from .api import PlannedBlackoutsApiError
+from .const import (
+    ATTR_BILL_IDS,
+    ATTR_END_DATE,
+    ATTR_PREFIX,
+    ATTR_QUERY,
+    ATTR_START_DATE,
+    CONF_API_TOKEN,
+    CONF_BILL_ID,
+    CONF_DAYS_AHEAD,
+    DATA_LOOKUP_LIMITER,
+    DEFAULT_DAYS_AHEAD,
+    DOMAIN,
+    LOOKUP_BURST,
+    LOOKUP_MAX_BILLS,
+    LOOKUP_MAX_DATA_AGE,
+    LOOKUP_MAX_DAYS,
+    LOOKUP_RATE,
+    MAX_CONCURRENT_FETCHES,
+    OUTAGE_TIME_ZONE,
+    RANGE_CHUNK_DAYS,
+    SERVICE_GET_OUTAGES,
+    SERVICE_SEARCH_OUTAGES,
+)
+from .coordinator import PlannedBlackoutsDataUpdateCoordinator
+from .engine import async_get_engine
+from .models import Outage
+from .ratelimit import TokenBucket
+
+_LOGGER = logging.getLogger(__name__)
+
+_OUTAGE_TZ = dt_util.get_time_zone(OUTAGE_TIME_ZONE)
+
+GET_OUTAGES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_BILL_IDS): vol.All(
+            cv.ensure_list, [cv.string], vol.Length(min=1, max=LOOKUP_MAX_BILLS)
+        ),
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(CONF_API_TOKEN): cv.string,
+    }
+)
+
+SEARCH_OUTAGES_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_QUERY): vol.All(cv.string, vol.Length(min=1)),
+        vol.Optional(ATTR_PREFIX, default=True): cv.boolean,
+        vol.Optional(ATTR_START_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Planned Blackouts services."""
+
+    async def async_get_outages(call: ServiceCall) -> ServiceResponse:
+        """Look up the outages of many bills at once."""
+        return await _async_get_outages(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_OUTAGES,
+        async_get_outages,
+        schema=GET_OUTAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    @callback
+    def async_search_outages(call: ServiceCall) -> ServiceResponse:
+        """Find the outages of all configured bills by address."""
+        return _search_outages(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_OUTAGES,
+        async_search_outages,
+        schema=SEARCH_OUTAGES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+async def _async_get_outages(
+    hass: HomeAssistant, call: ServiceCall
+) -> ServiceResponse:
+    """Fan the lookups out and return the outages keyed by bill."""
+    today = dt_util.now(_OUTAGE_TZ).date()
+    first_day: date = call.data.get(ATTR_START_DATE, today)
+    last_day: date = call.data.get(
+        ATTR_END_DATE, first_day + timedelta(days=DEFAULT_DAYS_AHEAD)
+    )
+    if last_day < first_day:
+        raise ServiceValidationError("end_date must not be before start_date")
+    if (last_day - first_day).days >= LOOKUP_MAX_DAYS:
+        raise ServiceValidationError(
+            f"A lookup can cover at most {LOOKUP_MAX_DAYS} days"
+        )
+
+    coordinators: Dict[str, PlannedBlackoutsDataUpdateCoordinator] = {
+        coordinator.entry.data[CONF_BILL_ID]: coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+    }
+    token: Optional[str] = call.data.get(CONF_API_TOKEN)
+    if token is None:
+        if not coordinators:
+            raise ServiceValidationError(
+                "An api_token is needed when no bill is configured"
+            )
+        token = next(iter(coordinators.values())).entry.data[CONF_API_TOKEN]
+
+    if (limiter := hass.data.get(DATA_LOOKUP_LIMITER)) is None:
+        limiter = hass.data[DATA_LOOKUP_LIMITER] = TokenBucket(
+            LOOKUP_RATE, LOOKUP_BURST
+        )
+    engine = async_get_engine(hass)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    # Lookups may run before any entry has imported the Shamsi calendar
+    await hass.async_add_executor_job(jalali.load)
+
+    async def _async_lookup(bill_id: str) -> Dict[str, Any]:
+        """Return the outages of one bill, or the error looking them up."""
+        coordinator = coordinators.get(bill_id)
+        if coordinator is not None and (
+            outages := _fresh_outages(coordinator, first_day, last_day)
+        ) is not None:
+            return {"source": "cache", "outages": _as_dicts(outages)}
+
+        async with semaphore:
+            client = engine.async_create_client(bill_id, token)
+            outages: List[Outage] = []
+            try:
+                # Requests cover at most RANGE_CHUNK_DAYS days, as range fetches do
+                chunk_start = first_day
+                while chunk_start <= last_day:
+                    chunk_end = min(
+                        chunk_start + timedelta(days=RANGE_CHUNK_DAYS - 1), last_day
+                    )
+                    await limiter.async_acquire()
+                    outages += await client.async_fetch_days(chunk_start, chunk_end)
+                    chunk_start = chunk_end + timedelta(days=1)
+            except ConfigEntryAuthFailed:
+                return {"error": "invalid_auth"}
+            except PlannedBlackoutsApiError as err:
+                return {"error": str(err)}
+
+        return {"source": "api", "outages": _as_dicts(outages)}
+
+    bill_ids: List[str] = list(dict.fromkeys(call.data[ATTR_BILL_IDS]))
+    results = await asyncio.gather(
+        *(_async_lookup(bill_id) for bill_id in bill_ids)
+    )
+    return {"bills": dict(zip(bill_ids, results))}
+
+
+@callback
+def _search_outages(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Return the outages whose address matches the query."""
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    if (first_day := call.data.get(ATTR_START_DATE)) is not None:
+        start = datetime.combine(first_day, time(), _OUTAGE_TZ)
+    if (last_day := call.data.get(ATTR_END_DATE)) is not None:
+        end = datetime.combine(last_day + timedelta(days=1), time(), _OUTAGE_TZ)
+
+    matches = async_get_address_index(hass).search(
+        call.data[ATTR_QUERY], prefix=call.data[ATTR_PREFIX], start=start, end=end
+    )
+    return {
+        "outages": [
+            {
+                "entry_id": match.entry_id,
+                CONF_BILL_ID: match.bill_id,
+                **_as_dict(match.outage),
+            }
+            for match in matches
+        ]
+    }
+
+
+def _fresh_outages(
+    coordinator: PlannedBlackoutsDataUpdateCoordinator,
+    first_day: date,
+    last_day: date,
+) -> Optional[List[Outage]]:
+    """Return the coordinator's outages in range if they are fresh enough."""
+    data = coordinator.data
+    if (
+        data is None
+        or data.stale
+        or dt_util.utcnow() - data.fetched_at > LOOKUP_MAX_DATA_AGE
+    ):
+        return None
+
+    # The coordinator only knows about the days of its polled window
+    window_start = data.fetched_at.astimezone(_OUTAGE_TZ).date()
+    window_end = window_start + timedelta(
+        days=coordinator.entry.data.get(CONF_DAYS_AHEAD, DEFAULT_DAYS_AHEAD)
+    )
+    if first_day < window_start or last_day > window_end:
+        return None
+
+    return [
+        outage
+        for outage in data.outages
+        if first_day <= outage.start.date() <= last_day
+    ]
+
+
+def _as_dicts(outages: List[Outage]) -> List[Dict[str, Any]]:
+    """Serialize outages for a service response."""
+    return [_as_dict(outage) for outage in sorted(outages, key=lambda item: item.start)]
+
+
+def _as_dict(outage: Outage) -> Dict[str, Any]:
+    """Serialize one outage for a service response."""
+    return {
+        **outage._asdict(),
+        "start": outage.start.isoformat(),
+        "end": outage.end.isoformat(),
+    }
@@ -0,0 +1,85 @@
+"""On-disk outage cache for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import CACHE_MAX_AGE, CACHE_SAVE_DELAY, DOMAIN, STORAGE_VERSION
+from .models import Outage, intern_text
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PlannedBlackoutsOutageStore:
+    """Persist the processed outages of a bill between restarts."""
+
+    def __init__(self, hass: HomeAssistant, bill_id: str) -> None:
+        """Initialize the outage store."""
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{bill_id}"
+        )
+
+    async def async_load(self) -> Optional[Tuple[List[Outage], datetime]]:
+        """Load cached outages and when they were saved, or None if not fresh."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+
+        try:
+            expires_at = dt_util.parse_datetime(data["expires_at"])
+            if expires_at is None or expires_at <= dt_util.utcnow():
+                _LOGGER.debug("Dropping expired outage cache %s", self._store.key)
+                await self._store.async_remove()
+                return None
+
+            saved_at = dt_util.parse_datetime(data["saved_at"])
+            if saved_at is None:
+                raise ValueError("Invalid saved_at")
+
+            outages = [
+                Outage(
+                    start=datetime.fromisoformat(outage["start"]),
+                    end=datetime.fromisoformat(outage["end"]),
+                    reason=intern_text(outage["reason"]),
+                    address=intern_text(outage["address"]),
+                    outage_number=outage["outage_number"],
+                )
+                for outage in data["outages"]
+            ]
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning(
+                "Ignoring corrupt outage cache %s: %s", self._store.key, err
+            )
+            await self._store.async_remove()
+            return None
+
+        return outages, saved_at
+
+    def async_save(self, outages: List[Outage]) -> None:
+        """Schedule the outages to be written to disk."""
+        saved_at = dt_util.utcnow()
+
+        def _data_to_save() -> Dict[str, Any]:
+            return {
+                "saved_at": saved_at.isoformat(),
+                "expires_at": (saved_at + CACHE_MAX_AGE).isoformat(),
+                "outages": [
+                    {
+                        **outage._asdict(),
+                        "start": outage.start.isoformat(),
+                        "end": outage.end.isoformat(),
+                    }
+                    for outage in outages
+                ],
+            }
+
+        self._store.async_delay_save(_data_to_save, CACHE_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the cached outages from disk."""
+        await self._store.async_remove()
@@ -0,0 +1,157 @@
+"""Incremental parsing of large JSON responses."""
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, List
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+# Parser states
+_OBJECT_START = 0
+_MEMBER = 1
+_VALUE = 2
+_ITEM = 3
+_DONE = 4
+
+
+class JsonArrayStreamParser:
+    """Extract the items of one array member of a JSON object as bytes arrive.
+
+    Only the current item, plus whatever part of the next chunk has not been
+    consumed yet, is ever held in memory. Other members of the top-level
+    object are decoded and discarded.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Initialize the parser for the array stored under key."""
+        self._key = key
+        self._json = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _OBJECT_START
+        self._member: str | None = None
+        # Separator bookkeeping for the container being walked
+        self._after_value = False
+        self._empty = True
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """Consume a chunk of the document and return the completed items."""
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk, final)
+        self._pos = 0
+        items: List[Any] = []
+
+        while self._state != _DONE and self._step(items, final):
+            pass
+
+        if final and self._state != _DONE:
+            raise ValueError("Unexpected end of JSON document")
+
+        return items
+
+    def _step(self, items: List[Any], final: bool) -> bool:
+        """Advance the parser by one token, returning False to wait for data."""
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        if pos == len(buffer):
+            return False
+
+        char = buffer[pos]
+
+        if self._state == _OBJECT_START:
+            if char != "{":
+                raise ValueError("Expected a JSON object")
+            self._pos = pos + 1
+            self._state = _MEMBER
+            return True
+
+        if self._state == _MEMBER:
+            if char == "}" and (self._after_value or self._empty):
+                self._pos = pos + 1
+                self._state = _DONE
+                return True
+            if self._after_value:
+                if char != ",":
+                    raise ValueError("Expected ',' or '}' in JSON object")
+                self._pos = pos + 1
+                self._after_value = False
+                return True
+            decoded = self._decode(pos, final)
+            if decoded is None:
+                return False
+            key, end = decoded
+            while end < len(buffer) and buffer[end] in _WHITESPACE:
+                end += 1
+            if end == len(buffer):
+                return False
+            if buffer[end] != ":":
+                raise ValueError("Expected ':' after object key")
+            self._pos = end + 1
+            self._member = key
+            self._state = _VALUE
+            return True
+
+        if self._state == _VALUE:
+            if self._member == self._key:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array under {self._key!r}")
+                self._pos = pos + 1
+                self._state = _ITEM
+                self._after_value = False
+                self._empty = True
+                return True
+            decoded = self._decode(pos, final)
+            if decoded is None:
+                return False
+            self._pos = decoded[1]
+            self._state = _MEMBER
+            self._after_value = True
+            self._empty = False
+            return True
+
+        # Inside the array
+        if char == "]" and (self._after_value or self._empty):
+            self._pos = pos + 1
+            self._state = _MEMBER
+            self._after_value = True
+            self._empty = False
+            return True
+        if self._after_value:
+            if char != ",":
+                raise ValueError("Expected ',' or ']' in JSON array")
+            self._pos = pos + 1
+            self._after_value = False
+            return True
+        decoded = self._decode(pos, final)
+        if decoded is None:
+            return False
+        item, self._pos = decoded
+        items.append(item)
+        self._after_value = True
+        self._empty = False
+        return True
+
+    def _decode(self, pos: int, final: bool) -> tuple[Any, int] | None:
+        """Decode the JSON value at pos, or None if it may still be incomplete."""
+        try:
+            value, end = self._json.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None
+
+        # A number cut off by the end of the chunk would still decode
+        if (
+            not final
+            and isinstance(value, (int, float))
+            and (end == len(self._buffer) or self._buffer[end] in _NUMBER_CHARS)
+        ):
+            return None
+
+        return value, end
+
@@ -0,0 +1,87 @@
+"""Single-timer min-heap shared by the Planned Blackouts schedulers."""
+from __future__ import annotations
+
+import heapq
+from datetime import datetime
+from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+# Heap items start with the UTC time they are due at
+_ItemT = TypeVar("_ItemT", bound=Tuple)
+
+
+class TimerHeap(Generic[_ItemT]):
+    """Keep timed items of all config entries behind a single timer.
+
+    Items sit in one min-heap and only the earliest live one is armed as a
+    timer. Owners retire items by making is_live return False for them
+    instead of searching the heap; retired items are skipped when they
+    surface and swept out once they make up most of the heap.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        is_live: Callable[[_ItemT], bool],
+        handle_due: Callable[[List[_ItemT]], None],
+    ) -> None:
+        """Initialize the heap with the owner's liveness check and handler."""
+        self._hass = hass
+        self._is_live = is_live
+        self._handle_due = handle_due
+        self._heap: List[_ItemT] = []
+        self._armed_at: Optional[datetime] = None
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+
+    def push(self, item: _ItemT) -> None:
+        """Add an item; call async_rearm once done pushing."""
+        heapq.heappush(self._heap, item)
+
+    @callback
+    def async_rearm(self, live: int) -> None:
+        """Sweep out retired items if needed and arm the earliest live one.
+
+        live is how many items in the heap the owner still considers live.
+        """
+        if len(self._heap) > 2 * live + 16:
+            self._heap = [item for item in self._heap if self._is_live(item)]
+            heapq.heapify(self._heap)
+        self._arm()
+
+    def _arm(self) -> None:
+        """Point the timer at the earliest live item."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+        when = heap[0][0] if heap else None
+        if when == self._armed_at:
+            return
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._armed_at = when
+        if when is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_fire, when
+            )
+
+    @callback
+    def _async_fire(self, now: datetime) -> None:
+        """Hand every live item that is due to the owner."""
+        self._unsub_timer = None
+        self._armed_at = None
+
+        due: List[_ItemT] = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            item = heapq.heappop(heap)
+            if self._is_live(item):
+                due.append(item)
+
+        if due:
+            self._handle_due(due)
+        self._arm()
@@ -0,0 +1,87 @@
+"""HTTP views for Planned Blackouts."""
+from __future__ import annotations
+
+import logging
+from http import HTTPStatus
+from typing import List, Optional, Tuple
+
+from aiohttp import web
+from aiohttp.helpers import ETAG_ANY
+
+from homeassistant.components.http import HomeAssistantView
+
+from .const import CALENDAR_NAME, DOMAIN
+from .ics import IcsFeed, combine_feeds
+
+_LOGGER = logging.getLogger(__name__)
+
+_CONTENT_TYPE = "text/calendar"
+
+
+class PlannedBlackoutsIcsView(HomeAssistantView):
+    """Serve the outages of one config entry as an iCalendar feed."""
+
+    url = f"/api/{DOMAIN}/calendar/{{entry_id}}.ics"
+    name = f"api:{DOMAIN}:calendar"
+
+    async def get(self, request: web.Request, entry_id: str) -> web.Response:
+        """Return the feed of an entry."""
+        hass = request.app["hass"]
+        coordinator = hass.data.get(DOMAIN, {}).get(entry_id)
+        if coordinator is None or (feed := coordinator.ics_feed) is None:
+            return self.json_message("Calendar not found", HTTPStatus.NOT_FOUND)
+
+        return _feed_response(request, feed)
+
+
+class PlannedBlackoutsCombinedIcsView(HomeAssistantView):
+    """Serve the outages of all config entries as one iCalendar feed."""
+
+    url = f"/api/{DOMAIN}/calendar.ics"
+    name = f"api:{DOMAIN}:calendar:all"
+
+    def __init__(self) -> None:
+        """Initialize the view."""
+        # (ETags of the entry feeds, the feed combining them)
+        self._combined: Optional[Tuple[Tuple[str, ...], IcsFeed]] = None
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return the feed of all entries."""
+        hass = request.app["hass"]
+        feeds: List[IcsFeed] = [
+            feed
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if (feed := coordinator.ics_feed) is not None
+        ]
+
+        # Only merge again when one of the entry feeds changed
+        etags = tuple(feed.etag for feed in feeds)
+        if self._combined is None or self._combined[0] != etags:
+            self._combined = (etags, combine_feeds(CALENDAR_NAME, feeds))
+
+        return _feed_response(request, self._combined[1])
+
+
+def _feed_response(request: web.Request, feed: IcsFeed) -> web.Response:
+    """Return the feed, or 304 if the client already has this version."""
+    if (if_none_match := request.if_none_match) is not None:
+        not_modified = any(
+            tag.value == feed.etag or tag.value == ETAG_ANY for tag in if_none_match
+        )
+    else:
+        not_modified = (
+            request.if_modified_since is not None
+            and feed.last_modified <= request.if_modified_since
+        )
+
+    if not_modified:
+        response = web.Response(status=HTTPStatus.NOT_MODIFIED)
+    else:
+        response = web.Response(
+            body=feed.body, content_type=_CONTENT_TYPE, charset="utf-8"
+        )
+    response.etag = feed.etag
+    response.last_modified = feed.last_modified
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+